@@ -0,0 +1,323 @@
+"""Local stand-in for the auth service the app uses when built with REACT_APP_AUTH_URL.
+
+Users live in a dict keyed on the lower-cased email with a per-user salt and
+sha256(salt + password), so a login costs one lookup and one hash whatever the
+number of accounts. Digests are compared with hmac.compare_digest and unknown
+emails are checked against a dummy digest, so a wrong email takes as long as a
+wrong password. Sessions are stateless HMAC-signed tokens with an expiry.
+
+sha256 keeps seeding a million accounts fast. It is a stand-in for tests; a
+real service should use a slow password hash such as scrypt.
+
+Endpoints (JSON in, JSON out, CORS enabled, HTTP/1.1 keep-alive):
+
+    POST /login    {"email", "password"}    -> {"token", "email", "expiresAt"} or 401
+    POST /google   {"credential"}           -> same, for a Google ID token with a verified email
+    POST /session  {"token"}                -> {"email", "expiresAt"} or 401
+    POST /seed     {"users": [{"email", "password"}], "generate": N}  -> {"users": total}
+
+Accounts seeded without a password can only sign in through Google.
+
+    python auth_server.py --port 4000 --users 100000
+    python auth_server.py --benchmark
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import http.client
+import json
+import logging
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark import percentile
+
+DEFAULT_PORT = 4000
+SESSION_TTL = 3600  # seconds
+BENCHMARK_SIZES = (1000, 100000, 1000000)
+# Mirrors LOCAL_USERS in src/authProvider.js
+DEFAULT_USERS = [
+    {"email": "name@mail.com", "password": "password"},
+    {"email": "validationtest542@gmail.com"},  # Google-only, no password
+]
+
+
+def generated_user(index):
+    """Email and password of the index-th generated account."""
+    return f"user{index}@example.com", f"password{index}"
+
+
+def b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class UserStore:
+    """Accounts keyed on the lower-cased email. Password accounts store salt + digest, Google-only ones b""."""
+
+    SALT_SIZE = 16
+
+    def __init__(self):
+        self.users = {}
+        self.generated = 0
+        self.unknown = bytes(self.SALT_SIZE) + hashlib.sha256(b"").digest()
+
+    def __len__(self):
+        return len(self.users)
+
+    def add(self, email, password=None):
+        """Add or replace an account; without a password it can only sign in through Google."""
+        if password is None:
+            record = b""
+        else:
+            salt = os.urandom(self.SALT_SIZE)
+            record = salt + hashlib.sha256(salt + password.encode()).digest()
+        self.users[email.lower()] = record
+
+    def generate(self, count):
+        """Add `count` accounts after the ones generated so far, see generated_user."""
+        for index in range(self.generated, self.generated + count):
+            self.add(*generated_user(index))
+        self.generated += count
+
+    def check_password(self, email, password):
+        record = self.users.get(email.lower())
+        known = bool(record)
+        # Hash and compare even for unknown emails so both take the same time
+        record = record if known else self.unknown
+        salt, digest = record[:self.SALT_SIZE], record[self.SALT_SIZE:]
+        matches = hmac.compare_digest(hashlib.sha256(salt + password.encode()).digest(), digest)
+        return matches and known
+
+    def is_google_account(self, email):
+        return self.users.get(email.lower()) == b""
+
+
+class AuthService:
+    """Logins and HMAC-signed session tokens over a UserStore."""
+
+    def __init__(self, store, secret=None, ttl=SESSION_TTL):
+        self.store = store
+        self.secret = secret or secrets.token_bytes(32)
+        self.ttl = ttl
+
+    def sign(self, payload):
+        return b64encode(hmac.new(self.secret, payload.encode(), hashlib.sha256).digest())
+
+    def issue(self, email):
+        expires_at = int((time.time() + self.ttl) * 1000)  # ms, like Date.now()
+        payload = b64encode(json.dumps({"email": email, "expiresAt": expires_at}).encode())
+        return {"token": f"{payload}.{self.sign(payload)}", "email": email, "expiresAt": expires_at}
+
+    def login(self, email, password):
+        if not isinstance(email, str) or not isinstance(password, str):
+            return None
+        return self.issue(email) if self.store.check_password(email, password) else None
+
+    def google(self, credential):
+        """Session for a Google ID token whose email is verified and has an account.
+
+        The token's signature is not checked; this stand-in trusts the credential
+        the way the app's local provider does.
+        """
+        try:
+            claims = json.loads(b64decode(credential.split(".")[1]))
+        except (AttributeError, IndexError, ValueError):
+            return None
+        email = claims.get("email")
+        if not claims.get("email_verified") or not isinstance(email, str) or not self.store.is_google_account(email):
+            return None
+        return self.issue(email)
+
+    def validate(self, token):
+        """Return {"email", "expiresAt"} for a token this service signed that has not expired."""
+        try:
+            payload, signature = token.split(".")
+        except (AttributeError, ValueError):
+            return None
+        if not hmac.compare_digest(self.sign(payload), signature):
+            return None
+        session = json.loads(b64decode(payload))
+        return session if session["expiresAt"] > time.time() * 1000 else None
+
+    def seed(self, users=(), generate=0):
+        """Add `users` and `generate` numbered accounts. Raises ValueError, adding nothing, on malformed input."""
+        if not isinstance(users, list) or not all(
+            isinstance(user, dict)
+            and isinstance(user.get("email"), str)
+            and isinstance(user.get("password"), (str, type(None)))
+            for user in users
+        ):
+            raise ValueError('"users" must be a list of {"email", "password"} with string values')
+        if not isinstance(generate, int) or isinstance(generate, bool) or generate < 0:
+            raise ValueError('"generate" must be a whole number of at least 0')
+        for user in users:
+            self.store.add(user["email"], user.get("password"))
+        self.store.generate(generate)
+        return {"users": len(self.store)}
+
+
+class AuthHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests and send small responses right away
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    service = None
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+    def send_cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Max-Age", "86400")
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_cors_headers()
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.send_cors_headers()
+        self.end_headers()
+
+    def do_POST(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": "invalid JSON"})
+            return
+        if not isinstance(body, dict):
+            self.send_json(400, {"error": "expected a JSON object"})
+            return
+        if self.path == "/login":
+            result = self.service.login(body.get("email"), body.get("password"))
+        elif self.path == "/google":
+            result = self.service.google(body.get("credential"))
+        elif self.path == "/session":
+            result = self.service.validate(body.get("token"))
+        elif self.path == "/seed":
+            try:
+                result = self.service.seed(body.get("users", []), body.get("generate", 0))
+            except ValueError as error:
+                self.send_json(400, {"error": str(error)})
+                return
+        else:
+            self.send_json(404, {"error": f"no endpoint {self.path}"})
+            return
+        if result is None:
+            self.send_json(401, {"error": "invalid credentials"})
+        else:
+            self.send_json(200, result)
+
+
+def make_server(service, port=DEFAULT_PORT, host="localhost"):
+    handler = type("Handler", (AuthHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def default_service(generate=0):
+    store = UserStore()
+    service = AuthService(store)
+    service.seed(DEFAULT_USERS, generate)
+    return service
+
+
+def time_calls(call, arguments):
+    """Per-call latencies in ms."""
+    latencies = []
+    for args in arguments:
+        start = time.perf_counter()
+        call(*args)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def format_latencies(latencies):
+    return ", ".join(f"p{q} {percentile(latencies, q):.3f}ms" for q in (50, 95, 99))
+
+
+def benchmark(sizes=BENCHMARK_SIZES, logins=2000):
+    rng = random.Random(0)
+    for size in sizes:
+        start = time.perf_counter()
+        service = default_service(size)
+        seed_time = time.perf_counter() - start
+        accounts = [generated_user(rng.randrange(size)) for _ in range(logins)]
+        wrong_password = [(email, "wrong") for email, _ in accounts]
+        unknown = [(f"nobody{i}@example.com", "wrong") for i in range(logins)]
+
+        latencies = {
+            "login": time_calls(service.login, accounts),
+            "wrong password": time_calls(service.login, wrong_password),
+            "unknown email": time_calls(service.login, unknown),
+        }
+
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+        def post(connection, email, password):
+            connection.request("POST", "/login", json.dumps({"email": email, "password": password}),
+                               {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+
+        # One kept-alive connection, the way the browser reuses its connection
+        connection = http.client.HTTPConnection("localhost", port)
+        reused = time_calls(lambda email, password: post(connection, email, password), accounts[:1000])
+        connection.close()
+        fresh = time_calls(
+            lambda email, password: post(http.client.HTTPConnection("localhost", port), email, password),
+            accounts[:200],
+        )
+        server.shutdown()
+        server.server_close()
+
+        print(f"{size:>8,} users (seeded in {seed_time:.1f}s)")
+        for name, values in latencies.items():
+            print(f"  {name + ':':<22} {format_latencies(values)}")
+        print(f"  {'HTTP, kept-alive:':<22} {format_latencies(reused)}")
+        print(f"  {'HTTP, new connection:':<22} {format_latencies(fresh)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--users", type=int, default=0, help="Generated accounts to add to the built-in ones")
+    parser.add_argument("--benchmark", action="store_true", help="Time logins at 1k, 100k and 1M users and exit")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark()
+        return 0
+    server = make_server(default_service(args.users), args.port)
+    logging.info(f"Auth service on http://localhost:{args.port} with {len(server.RequestHandlerClass.service.store)} users")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(main())
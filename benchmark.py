@@ -0,0 +1,206 @@
+"""Page-load benchmark for the app.
+
+Loads every page several times with a cold and with a warm browser cache and
+collects Navigation Timing and the web-vitals reported by src/reportWebVitals.js.
+The p50/p95/p99 of each metric are compared against the JSON baseline, and any
+page whose p95 got slower than the baseline by more than the threshold is
+reported as a regression. The baseline is rewritten when the run passes.
+The cold-cache transfer size and time-to-interactive of the login page are
+also checked against fixed budgets.
+
+    python benchmark.py --runs 10 --threshold 0.2
+"""
+import argparse
+import json
+import logging
+import sys
+
+BASELINE_FILE = "perf_baseline.json"
+PAGES = {
+    "login": "/",
+    "distance_to_sun": "/distance-to-sun",
+    "nearest_sea": "/nearest-sea",
+}
+# The page counts as loaded once React has rendered its heading
+READY_XPATH = {
+    "login": "//h1",  # Typography variant="h4" component="h1"
+    "distance_to_sun": "//h5",
+    "nearest_sea": "//h5",
+}
+PERCENTILES = (50, 95, 99)
+# Regressions smaller than this are treated as noise (milliseconds, CLS is unitless)
+MIN_DELTA = {"CLS": 0.05}
+DEFAULT_MIN_DELTA = 10.0
+# First-load budgets for the login page (the dev server bundle is not minified)
+TRANSFER_BUDGET_KB = 5000
+TTI_BUDGET_MS = 3000
+
+COLLECT_SCRIPT = """
+const nav = performance.getEntriesByType("navigation")[0];
+const paint = performance.getEntriesByName("first-contentful-paint")[0];
+const buffered = (type) => {
+  try {
+    const observer = new PerformanceObserver(() => {});
+    observer.observe({ type, buffered: true });
+    const entries = observer.takeRecords();
+    observer.disconnect();
+    return entries;
+  } catch (error) {
+    return [];
+  }
+};
+const lcp = buffered("largest-contentful-paint");
+const shifts = buffered("layout-shift").filter((entry) => !entry.hadRecentInput);
+const longTasks = buffered("longtask");
+const metrics = {
+  TTFB: nav ? nav.responseStart : null,
+  FCP: paint ? paint.startTime : null,
+  LCP: lcp.length ? lcp[lcp.length - 1].startTime : null,
+  CLS: shifts.reduce((sum, entry) => sum + entry.value, 0),
+  domInteractive: nav ? nav.domInteractive : null,
+  domContentLoaded: nav ? nav.domContentLoadedEventEnd : null,
+  load: nav ? nav.loadEventEnd : null,
+  // Approximate time-to-interactive: content painted, DOM ready and the last long task finished
+  TTI: Math.max(
+    paint ? paint.startTime : 0,
+    nav ? nav.domContentLoadedEventEnd : 0,
+    ...longTasks.map((entry) => entry.startTime + entry.duration)
+  ),
+  transferSize: performance.getEntriesByType("resource")
+    .reduce((sum, entry) => sum + entry.transferSize, nav ? nav.transferSize : 0),
+};
+// Values reported by the web-vitals library win when it has already reported them
+return Object.assign(metrics, window.__webVitals || {});
+"""
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    """Turn a list of metric dicts into {metric: {"p50": ..., "p95": ..., "p99": ...}}."""
+    summary = {}
+    for metric in sorted({name for sample in samples for name in sample}):
+        values = [sample[metric] for sample in samples if sample.get(metric) is not None]
+        if values:
+            summary[metric] = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+    return summary
+
+
+def measure_page(driver, waiter, url, ready_xpath, cold):
+    if cold:
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    driver.get(url)
+    waiter.for_visible(ready_xpath)
+    return driver.execute_script(COLLECT_SCRIPT)
+
+
+def run_benchmark(driver, base_url, email, password=None, runs=10):
+    """Measure every page `runs` times cold and warm and return the percentile summary."""
+    from login_fixtures import seed_session
+    from waits import Waiter
+
+    waiter = Waiter(driver)
+    driver.execute_cdp_cmd("Network.enable", {})
+    seed_session(driver, base_url, email, password)
+    results = {}
+    for name, path in PAGES.items():
+        url = base_url + path
+        results[name] = {}
+        for cache in ("cold", "warm"):
+            if cache == "warm":
+                # Prime the cache so every measured load is served from it
+                measure_page(driver, waiter, url, READY_XPATH[name], cold=False)
+            samples = [measure_page(driver, waiter, url, READY_XPATH[name], cold=cache == "cold") for _ in range(runs)]
+            results[name][cache] = summarize(samples)
+            load = results[name][cache].get("load", {})
+            logging.info(f"{name} ({cache} cache): load p50 {load.get('p50', 0):.0f}ms, p95 {load.get('p95', 0):.0f}ms")
+    return results
+
+
+def find_regressions(results, baseline, threshold, gate="p95"):
+    """Return a message for every page metric that got slower than the baseline by more than `threshold`."""
+    regressions = []
+    for page, caches in results.items():
+        for cache, metrics in caches.items():
+            for metric, stats in metrics.items():
+                previous = baseline.get(page, {}).get(cache, {}).get(metric, {}).get(gate)
+                if previous is None or metric == "transferSize":
+                    continue
+                allowed = max(previous * threshold, MIN_DELTA.get(metric, DEFAULT_MIN_DELTA))
+                if stats[gate] - previous > allowed:
+                    regressions.append(
+                        f"{page} ({cache} cache) {metric} {gate} regressed: "
+                        f"{stats[gate]:.2f} vs baseline {previous:.2f}"
+                    )
+    return regressions
+
+
+def check_budgets(results, transfer_budget_kb=TRANSFER_BUDGET_KB, tti_budget_ms=TTI_BUDGET_MS):
+    """Return a message for each first-load budget the login page's cold p95 is over."""
+    failures = []
+    cold = results.get("login", {}).get("cold", {})
+    transfer = cold.get("transferSize", {}).get("p95")
+    if transfer is not None and transfer > transfer_budget_kb * 1024:
+        failures.append(f"login transfer size p95 {transfer / 1024:.0f} kB is over the {transfer_budget_kb} kB budget")
+    tti = cold.get("TTI", {}).get("p95")
+    if tti is not None and tti > tti_budget_ms:
+        failures.append(f"login time-to-interactive p95 {tti:.0f}ms is over the {tti_budget_ms}ms budget")
+    return failures
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def check_against_baseline(results, path=BASELINE_FILE, threshold=0.2, update=False):
+    """Gate `results` on the baseline file.
+
+    The baseline is only written when there is none yet or `update` is set, so
+    runs that each pass while a little slower cannot drift it upwards.
+    """
+    baseline = load_baseline(path)
+    regressions = find_regressions(results, baseline, threshold)
+    if not baseline or update:
+        save_baseline(path, results)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95 slowdown, 0.2 means 20%%")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--transfer-budget-kb", type=float, default=TRANSFER_BUDGET_KB)
+    parser.add_argument("--tti-budget-ms", type=float, default=TTI_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    from driver_pool import BASE_URL, pool
+    from selenium_tests import TEST_EMAIL, TEST_PASSWORD
+
+    results = run_benchmark(pool.acquire(), BASE_URL, TEST_EMAIL, TEST_PASSWORD, runs=args.runs)
+    regressions = check_against_baseline(results, args.baseline, args.threshold, args.update_baseline)
+    regressions += check_budgets(results, args.transfer_budget_kb, args.tti_budget_ms)
+    for message in regressions:
+        logging.error(message)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
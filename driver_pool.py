@@ -0,0 +1,110 @@
+import atexit
+import logging
+import os
+import time
+from selenium import webdriver
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from waits import install_signals
+
+BASE_URL = "http://localhost:3000"
+
+
+def fresh_browser(test_method):
+    """Opt a test out of the shared browser; it gets its own Chrome that is quit afterwards."""
+    test_method.fresh_browser = True
+    return test_method
+
+
+class DriverPool:
+    """One Chrome per worker process, reset between tests instead of restarted."""
+
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self.driver = None
+        self.setup_times = []
+        self.reset_times = []
+
+    def options(self):
+        chrome_options = Options()
+        if os.environ.get("SELENIUM_HEADLESS"):
+            chrome_options.add_argument("--headless=new")
+        return chrome_options
+
+    def new_driver(self, options=None):
+        """Start a brand new Chrome on the app and record how long it took."""
+        start = time.perf_counter()
+        driver = webdriver.Chrome(options=options or self.options())
+        install_signals(driver)
+        driver.get(self.base_url)
+        self.setup_times.append(time.perf_counter() - start)
+        return driver
+
+    def acquire(self):
+        """Return the worker's browser, starting it on first use and resetting it afterwards."""
+        if self.driver is None:
+            self.driver = self.new_driver()
+            return self.driver
+        try:
+            self.reset(self.driver)
+        except WebDriverException:
+            # The browser crashed or was closed by a test, start over
+            logging.warning("Shared browser could not be reset, starting a new one.")
+            self.quit()
+            self.driver = self.new_driver()
+        return self.driver
+
+    def reset(self, driver):
+        """Put the browser back into the state a fresh Chrome on the login page would have."""
+        start = time.perf_counter()
+        try:
+            driver.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+        # Close popups such as the Google sign-in window
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # Clearing by origin works from whatever page the last test ended on
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": self.base_url,
+            "storageTypes": "local_storage,cookies",
+        })
+        driver.delete_all_cookies()
+        driver.execute_cdp_cmd("Emulation.clearGeolocationOverride", {})
+        driver.execute_cdp_cmd("Browser.resetPermissions", {})
+        driver.get(self.base_url)
+        # sessionStorage belongs to the tab, not the origin's storage, so clear it from the page
+        driver.execute_script("sessionStorage.clear();")
+        self.reset_times.append(time.perf_counter() - start)
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+    def report(self):
+        """Log browser start and reset timings, and the time saved by resetting."""
+        if not self.setup_times:
+            return
+        average_setup = sum(self.setup_times) / len(self.setup_times)
+        average_reset = sum(self.reset_times) / len(self.reset_times) if self.reset_times else 0.0
+        saved = len(self.reset_times) * (average_setup - average_reset)
+        logging.info(
+            f"Driver pool: {len(self.setup_times)} browser start(s), average {average_setup:.3f}s; "
+            f"{len(self.reset_times)} reset(s), average {average_reset:.3f}s; "
+            f"about {saved:.1f}s saved by reusing the browser"
+        )
+
+    def close(self):
+        self.quit()
+        self.report()
+
+
+pool = DriverPool()
+atexit.register(pool.close)
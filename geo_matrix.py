@@ -0,0 +1,232 @@
+"""Drive many geolocation cases through /nearest-sea with warm browsers.
+
+Cases come from a CSV or JSON file with `lat`, `lng`, `permission` ("granted"
+or "denied") and `kind` ("valid", "boundary", "invalid" or "denied") columns.
+Each worker logs in once and then, for every case, switches the geolocation
+permission with Browser.grantPermissions/setPermission, sets the position with
+Emulation.setGeolocationOverride and remounts the page without a reload. The
+latency is measured from the override until the page has rendered its result.
+
+    python geo_matrix.py --generate 5000 cases.csv
+    python geo_matrix.py cases.csv --workers 4 --output results.csv
+"""
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from benchmark import percentile
+from nearest_sea import nearest_sea, random_points, to_fixed
+
+GPS_ERROR = "Enable GPS and Try Again"
+
+# Leaves /nearest-sea for the login route and comes back, which remounts the page
+# so it asks for the position again, without reloading the app. React 18 batches
+# two navigations in a row into one render, which would keep the page mounted, so
+# the script waits for the login page (the only page with an h1) in between.
+# React renders the page again after this script returns, so the current results
+# are marked as stale first. Resolves to false if the login page never rendered.
+REMOUNT_SCRIPT = """
+const done = arguments[arguments.length - 1];
+document.querySelectorAll("h6").forEach((node) => { node.dataset.stale = "true"; });
+const go = (path) => {
+  history.pushState({}, "", path);
+  dispatchEvent(new PopStateEvent("popstate"));
+};
+go("/");
+const started = performance.now();
+const check = () => {
+  if (document.querySelector("h1")) {
+    go("/nearest-sea");
+    done(true);
+  } else if (performance.now() - started > 5000) {
+    done(false);
+  } else {
+    setTimeout(check, 5);
+  }
+};
+check();
+"""
+
+# Resolves with the remounted page's answer once it is no longer "Calculating..."
+# (MUI renders both the distance and the subtitle lines as h6)
+RESULT_CONDITION = """
+const lines = [...document.querySelectorAll("h6:not([data-stale])")].map((node) => node.textContent);
+const distance = lines.find((line) => line.startsWith("Distance:"));
+if (distance) {
+  const name = lines.find((line) => line.startsWith("Nearest Sea:"));
+  return name ? distance + "|" + name : null;
+}
+return lines.find((line) => line.includes(args[0])) || null;
+"""
+
+
+def load_cases(path):
+    """Read cases from a .json list of objects or a .csv file with a header row."""
+    with open(path, newline="") as f:
+        rows = json.load(f) if path.endswith(".json") else list(csv.DictReader(f))
+    return [
+        {
+            "lat": float(row["lat"]),
+            "lng": float(row["lng"]),
+            "permission": row.get("permission") or "granted",
+            "kind": row.get("kind") or "valid",
+        }
+        for row in rows
+    ]
+
+
+def generate_cases(count, seed=0):
+    """Mostly valid positions plus boundary, out-of-range and denied-permission cases."""
+    boundary = [(90, 0), (-90, 0), (0, 180), (0, -180), (90, 180), (-90, -180), (0, 0)]
+    invalid = [(90.0001, 0), (-91, 10), (10, 180.5), (0, -181), (1000, 1000)]
+    cases = [{"lat": lat, "lng": lng, "permission": "granted", "kind": "boundary"} for lat, lng in boundary]
+    cases += [{"lat": lat, "lng": lng, "permission": "granted", "kind": "invalid"} for lat, lng in invalid]
+    denied = max(1, count // 20)
+    lats, lngs = random_points(max(0, count - len(cases)), seed)
+    for i, (lat, lng) in enumerate(zip(lats.tolist(), lngs.tolist())):
+        kind = "denied" if i < denied else "valid"
+        cases.append({"lat": lat, "lng": lng, "permission": "denied" if kind == "denied" else "granted", "kind": kind})
+    return cases[:count]
+
+
+def save_rows(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def set_permission(driver, base_url, permission):
+    if permission == "denied":
+        driver.execute_cdp_cmd("Browser.setPermission", {
+            "origin": base_url,
+            "permission": {"name": "geolocation"},
+            "setting": "denied",
+        })
+    else:
+        driver.execute_cdp_cmd("Browser.grantPermissions", {"origin": base_url, "permissions": ["geolocation"]})
+
+
+def check_case(case, outcome, expected):
+    """Return None if the rendered outcome is right for the case, otherwise the reason it is not."""
+    if case["kind"] == "denied":
+        return None if outcome == GPS_ERROR else f"expected the GPS error, got {outcome!r}"
+    if case["kind"] == "invalid":
+        # Chrome may refuse the override, report the position as unavailable, or
+        # pass it on, in which case the page must show what the engine computes.
+        # Hanging is never right.
+        if outcome.startswith("rejected:") or outcome in (GPS_ERROR, expected):
+            return None
+        return f"expected a rejected override, the GPS error or {expected!r}, got {outcome!r}"
+    return None if outcome == expected else f"expected {expected!r}, got {outcome!r}"
+
+
+def run_cases(driver, waiter, base_url, cases):
+    """Run cases in a logged-in browser that is on /nearest-sea and return one record per case."""
+    names, distances = nearest_sea([case["lat"] for case in cases], [case["lng"] for case in cases])
+    records = []
+    permission = None
+    for case, name, distance in zip(cases, names, distances.tolist()):
+        if case["permission"] != permission:
+            driver.execute_cdp_cmd("Browser.resetPermissions", {})
+            set_permission(driver, base_url, case["permission"])
+            permission = case["permission"]
+        expected = f"Distance: {to_fixed(distance)} km|Nearest Sea: {name}"
+        start = time.perf_counter()
+        try:
+            driver.execute_cdp_cmd("Emulation.setGeolocationOverride", {
+                "latitude": case["lat"],
+                "longitude": case["lng"],
+                "accuracy": 100,
+            })
+        except WebDriverException as error:
+            # Only Chrome refusing the position counts as rejected, later errors are failures
+            outcome = f"rejected: {error.msg}"
+        else:
+            try:
+                if not driver.execute_async_script(REMOUNT_SCRIPT):
+                    raise TimeoutException("The login page did not render while remounting")
+                outcome = waiter.until(RESULT_CONDITION, "nearest sea result", GPS_ERROR, timeout=10)
+            except TimeoutException:
+                outcome = "timeout"
+            except WebDriverException as error:
+                outcome = f"error: {error.msg}"
+        latency = time.perf_counter() - start
+        problem = check_case(case, outcome, expected)
+        records.append({**case, "outcome": outcome, "latency": latency, "ok": problem is None, "problem": problem or ""})
+    return records
+
+
+def run_worker(cases):
+    """Run a share of the cases in this worker process with its own headless Chrome."""
+    os.environ["SELENIUM_HEADLESS"] = "1"
+    from driver_pool import BASE_URL, pool
+    from login_fixtures import login_through_storage
+    from selenium_tests import TEST_EMAIL, TEST_PASSWORD
+    from waits import Waiter
+
+    driver = pool.acquire()
+    login_through_storage(driver, BASE_URL, f"{BASE_URL}/nearest-sea", TEST_EMAIL, TEST_PASSWORD)
+    try:
+        return run_cases(driver, Waiter(driver), BASE_URL, cases)
+    finally:
+        pool.close()
+
+
+def report(records, wall_time):
+    latencies = [record["latency"] * 1000 for record in records]
+    failures = [record for record in records if not record["ok"]]
+    kinds = {}
+    for record in records:
+        kinds.setdefault(record["kind"], [0, 0])
+        kinds[record["kind"]][0] += 1
+        kinds[record["kind"]][1] += not record["ok"]
+    for kind, (total, failed) in sorted(kinds.items()):
+        print(f"{kind:>9}: {total} cases, {failed} failed")
+    for record in failures[:20]:
+        print(f"FAIL ({record['kind']}) {record['lat']}, {record['lng']}: {record['problem']}")
+    print(
+        f"Latency p50 {percentile(latencies, 50):.0f}ms, p95 {percentile(latencies, 95):.0f}ms, "
+        f"p99 {percentile(latencies, 99):.0f}ms"
+    )
+    print(f"{len(records)} cases in {wall_time:.1f}s, {len(records) / wall_time * 60:.0f} cases/min")
+    return not failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", help="CSV or JSON file of cases, or the file to write with --generate")
+    parser.add_argument("--generate", type=int, metavar="COUNT", help="Write COUNT generated cases instead of running")
+    parser.add_argument("--workers", "-n", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--output", help="Write per-case results to this CSV file")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        save_rows(args.cases, generate_cases(args.generate))
+        return 0
+
+    cases = load_cases(args.cases)
+    workers = max(1, min(args.workers, len(cases)))
+    # Round-robin split keeps every worker's mix of valid, boundary and denied cases similar
+    shares = [cases[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        records = [record for share in executor.map(run_worker, shares) for record in share]
+    wall_time = time.perf_counter() - start
+    if args.output:
+        save_rows(args.output, records)
+    return 0 if report(records, wall_time) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""Load test: many concurrent simulated users against the app's server.
+
+Two kinds of users run at the same time:
+
+* HTTP users, lightweight asyncio clients on keep-alive HTTP/1.1 connections,
+  play a visit the way the browser's network sees it: the login route, every
+  static asset it references, then /distance-to-sun and /nearest-sea. Their
+  number ramps up through --stages, and each stage is reported on its own.
+* Browser users, a small pool of headless Chromes (one per worker process),
+  run the full LoginTestCases flow for the whole test: log in through the form
+  with TEST_EMAIL/TEST_PASSWORD, wait for the sun page, then click through to
+  the nearest-sea page and wait for its result.
+
+For every stage the report shows requests per second, latency percentiles and
+the error rate, followed by the browser flows' step latencies.
+
+    python load_test.py --stages 10,50,100,200,400 --stage-seconds 10 --browsers 4
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from benchmark import PAGES, percentile
+from driver_pool import BASE_URL
+
+ASSET_PATTERN = re.compile(r'(?:src|href)="(/[^"]+\.(?:js|css|ico|png|svg|json))"')
+FLOW_STEPS = ("login", "distance_to_sun", "nearest_sea")
+# Where the browser users are when the nearest-sea page asks for their position
+FLOW_POSITION = {"latitude": 41.0082, "longitude": 28.9784, "accuracy": 100}
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection that sends GET requests one at a time."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def get(self, path):
+        """Fetch `path` and return (status, body), reconnecting if the server closed the connection."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            "Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by the server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    # Skip the trailers up to the blank line
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                body += await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            # No length, the body ends when the server closes the connection
+            body = await self.reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, bytes(body)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def find_assets(html):
+    """Static assets the login route's HTML references, in document order."""
+    return list(dict.fromkeys(ASSET_PATTERN.findall(html)))
+
+
+async def http_user(host, port, paths, deadline, timeout, samples):
+    """Repeat the visit until `deadline`, appending (path, latency, ok) for every request."""
+    connection = Connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            for path in paths:
+                start = time.perf_counter()
+                try:
+                    status, _ = await asyncio.wait_for(connection.get(path), timeout)
+                    ok = status == 200
+                except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    connection.close()
+                    ok = False
+                samples.append((path, time.perf_counter() - start, ok))
+    finally:
+        connection.close()
+
+
+async def run_stage(host, port, paths, users, seconds, timeout):
+    samples = []
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(http_user(host, port, paths, deadline, timeout, samples) for _ in range(users)))
+    return samples, time.perf_counter() - start
+
+
+async def run_stages(base_url, stages, seconds, timeout):
+    """Discover the visit's requests, then ramp through the stages and return one summary per stage."""
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    connection = Connection(host, port)
+    try:
+        status, body = await asyncio.wait_for(connection.get("/"), timeout)
+    finally:
+        connection.close()
+    if status != 200:
+        raise RuntimeError(f"{base_url}/ answered {status}")
+    assets = find_assets(body.decode("utf-8", "replace"))
+    paths = [PAGES["login"], *assets, PAGES["distance_to_sun"], PAGES["nearest_sea"]]
+    logging.info(f"Each visit requests {len(paths)} paths: {', '.join(paths)}")
+
+    summaries = []
+    for users in stages:
+        samples, elapsed = await run_stage(host, port, paths, users, seconds, timeout)
+        summaries.append(summarize_stage(users, samples, elapsed))
+        log_stage(summaries[-1])
+    return summaries
+
+
+def summarize_stage(users, samples, elapsed):
+    latencies = [latency * 1000 for _, latency, ok in samples if ok]
+    errors = sum(1 for _, _, ok in samples if not ok)
+    summary = {
+        "users": users,
+        "requests": len(samples),
+        "rps": len(samples) / elapsed,
+        "error_rate": errors / len(samples) if samples else 1.0,
+    }
+    for q in (50, 95, 99):
+        summary[f"p{q}"] = percentile(latencies, q) if latencies else None
+    return summary
+
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.0f}ms"
+
+
+def log_stage(summary):
+    logging.info(
+        f"{summary['users']:>5} users: {summary['requests']:>7} requests, {summary['rps']:8.1f} req/s, "
+        f"p50 {format_ms(summary['p50'])}, p95 {format_ms(summary['p95'])}, p99 {format_ms(summary['p99'])}, "
+        f"errors {summary['error_rate']:.2%}"
+    )
+
+
+def run_browser_flows(base_url, deadline):
+    """Run the login -> sun -> nearest sea flow against `base_url` in this worker's headless Chrome until `deadline`."""
+    os.environ["SELENIUM_HEADLESS"] = "1"
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+
+    from driver_pool import pool
+    from login_fixtures import login_through_form
+    from selenium_tests import TEST_EMAIL, TEST_PASSWORD
+    from waits import Waiter
+
+    # The pool opens, and resets back to, the app under load rather than the default one
+    pool.base_url = base_url
+    records = []
+    try:
+        while time.time() < deadline:
+            record = {"ok": True, "problem": ""}
+            try:
+                driver = pool.acquire()
+                waiter = Waiter(driver)
+                driver.execute_cdp_cmd("Browser.grantPermissions", {"origin": pool.base_url, "permissions": ["geolocation"]})
+                driver.execute_cdp_cmd("Emulation.setGeolocationOverride", FLOW_POSITION)
+
+                start = time.perf_counter()
+                login_through_form(driver, waiter, TEST_EMAIL, TEST_PASSWORD)
+                record["login"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                waiter.for_visible("//button[@id='sun_button']")
+                record["distance_to_sun"] = time.perf_counter() - start
+
+                start = time.perf_counter()
+                driver.find_element(By.XPATH, "//button[contains(., 'Nearest Sea')]").click()
+                waiter.for_visible("//h6[contains(text(), 'Distance:')]")
+                record["nearest_sea"] = time.perf_counter() - start
+            except WebDriverException as error:
+                record.update(ok=False, problem=error.msg or type(error).__name__)
+            records.append(record)
+    finally:
+        pool.close()
+    return records
+
+
+def log_browser_flows(records):
+    failed = [record for record in records if not record["ok"]]
+    logging.info(f"Browser flows: {len(records)} run, {len(failed)} failed")
+    for step in FLOW_STEPS:
+        latencies = [record[step] * 1000 for record in records if step in record]
+        if latencies:
+            logging.info(
+                f"  {step:>15}: p50 {percentile(latencies, 50):.0f}ms, p95 {percentile(latencies, 95):.0f}ms, "
+                f"p99 {percentile(latencies, 99):.0f}ms"
+            )
+    for record in failed[:10]:
+        logging.info(f"  FAIL: {record['problem']}")
+    return len(failed) / len(records) if records else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--stages", default="10,50,100,200,400", help="Comma separated HTTP user counts to ramp through")
+    parser.add_argument("--stage-seconds", type=float, default=10.0)
+    parser.add_argument("--browsers", type=int, default=4, help="Headless browsers running the full flow, 0 for none")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds before a request counts as an error")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    stages = [int(users) for users in args.stages.split(",")]
+    # Browsers start first and keep running until the last stage ends
+    deadline = time.time() + len(stages) * args.stage_seconds
+    executor = None
+    futures = []
+    if args.browsers > 0:
+        executor = ProcessPoolExecutor(max_workers=args.browsers, mp_context=multiprocessing.get_context("spawn"))
+        futures = [executor.submit(run_browser_flows, args.base_url, deadline) for _ in range(args.browsers)]
+
+    try:
+        summaries = asyncio.run(run_stages(args.base_url, stages, args.stage_seconds, args.timeout))
+        records = [record for future in futures for record in future.result()]
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    worst = max(summary["error_rate"] for summary in summaries)
+    if futures:
+        worst = max(worst, log_browser_flows(records))
+    return 0 if worst <= args.max_error_rate else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(main())
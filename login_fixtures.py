@@ -0,0 +1,135 @@
+"""Login fixtures for the selenium tests.
+
+Most tests only need to be logged in, not to exercise the login form. For them
+`login_through_storage` writes the same localStorage state that
+LoginForm.handleSubmit writes after onSignIn succeeds and opens the target route
+directly. `login_through_form` types into the form and is meant for the tests
+that cover LoginForm itself. Both record their timings so the saving shows up
+in the logs.
+
+When the app is built with REACT_APP_AUTH_URL, set AUTH_URL to the same
+auth_server.py. `seed_users` then adds accounts to it, and sessions written to
+localStorage come from its /login, since ProtectedRoute checks their token with
+the service. That needs the account's password. Likewise set OIDC_STUB_URL to the
+oidc_stub.py behind REACT_APP_OIDC_STUB_URL to sign browsers in to "Google"
+with `sign_in_to_oidc_stub`.
+"""
+import http.client
+import json
+import logging
+import os
+import secrets
+import time
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+
+LOGIN_TIMINGS = {"storage": [], "form": []}
+AUTH_URL = os.environ.get("AUTH_URL")
+OIDC_STUB_URL = os.environ.get("OIDC_STUB_URL")
+SESSION_TTL = 3600  # seconds, like auth_server.py
+# One kept-alive connection to the auth service per process
+_auth_connection = None
+
+
+def auth_request(path, body, auth_url=None):
+    """POST JSON to the auth service and return (status, decoded response)."""
+    global _auth_connection
+    if _auth_connection is None:
+        parts = urlsplit(auth_url or AUTH_URL)
+        _auth_connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    try:
+        _auth_connection.request("POST", path, json.dumps(body), {"Content-Type": "application/json"})
+        response = _auth_connection.getresponse()
+    except (OSError, http.client.HTTPException):
+        _auth_connection.close()
+        _auth_connection = None
+        raise
+    return response.status, json.loads(response.read())
+
+
+def seed_users(users=(), generate=0, auth_url=None):
+    """Add `users` ({"email", "password"}) and `generate` numbered accounts to the auth service.
+
+    Returns the number of accounts it now has. Generated accounts are
+    auth_server.generated_user(i), numbered on from the ones generated before.
+    """
+    status, body = auth_request("/seed", {"users": list(users), "generate": generate}, auth_url)
+    if status != 200:
+        raise RuntimeError(f"Seeding the auth service failed: {status} {body}")
+    return body["users"]
+
+
+def new_session(email, password=None):
+    """A session for `email`: signed by the auth service when there is one, otherwise a local token."""
+    if AUTH_URL:
+        if password is None:
+            raise ValueError(f"A password for {email} is needed to get a session from the auth service")
+        status, body = auth_request("/login", {"email": email, "password": password})
+        if status != 200:
+            raise RuntimeError(f"Auth service refused {email}: {status} {body}")
+        return body
+    return {"token": secrets.token_hex(16), "email": email, "expiresAt": int((time.time() + SESSION_TTL) * 1000)}
+
+
+def seed_session(driver, base_url, email, password=None):
+    """Write the logged-in state for `email` into the app's localStorage, like saveSession in src/authProvider.js."""
+    if not driver.current_url.startswith(base_url):
+        # localStorage is per origin, so be on the app before writing to it
+        driver.get(base_url)
+    driver.execute_script(
+        "localStorage.setItem('session', arguments[0]);"
+        "localStorage.setItem('isLoggedIn', 'true'); localStorage.setItem('userEmail', arguments[1]);",
+        json.dumps(new_session(email, password)), email,
+    )
+
+
+def login_through_storage(driver, base_url, url, email, password=None):
+    """Log in without the UI and open `url`."""
+    start = time.perf_counter()
+    seed_session(driver, base_url, email, password)
+    driver.get(url)
+    LOGIN_TIMINGS["storage"].append(time.perf_counter() - start)
+
+
+def sign_in_to_oidc_stub(driver, base_url, email, email_verified=True):
+    """Sign this browser in to the OIDC stub as `email`, like being signed in to Google already.
+
+    The stub keeps the account in a cookie, so it is set from the browser itself,
+    and the shared browser's cookie reset signs it out again.
+    """
+    if not driver.current_url.startswith(base_url):
+        driver.get(base_url)
+    status = driver.execute_async_script(
+        """
+        const [url, email, emailVerified, done] = arguments;
+        fetch(url + "/session", {
+          method: "POST",
+          credentials: "include",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ email, email_verified: emailVerified }),
+        }).then((response) => done(response.status), () => done(0));
+        """,
+        OIDC_STUB_URL, email, email_verified,
+    )
+    if status != 200:
+        raise RuntimeError(f"Signing in to the OIDC stub at {OIDC_STUB_URL} failed: {status}")
+
+
+def login_through_form(driver, waiter, email, password, url=None):
+    """Log in by typing into the login form, then open `url` if given."""
+    start = time.perf_counter()
+    driver.find_element(By.ID, "email").send_keys(email)
+    driver.find_element(By.ID, "password").send_keys(password)
+    driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
+    waiter.for_route("/distance-to-sun")
+    if url:
+        driver.get(url)
+    LOGIN_TIMINGS["form"].append(time.perf_counter() - start)
+
+
+def report_login_timings():
+    for path, timings in LOGIN_TIMINGS.items():
+        if timings:
+            logging.info(
+                f"Login through {path}: {len(timings)} login(s), average {sum(timings) / len(timings):.3f}s"
+            )
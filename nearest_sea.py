@@ -0,0 +1,121 @@
+"""Vectorized Python twin of calculateDistanceToNearestSea in src/NearestSeaPage.js.
+
+`nearest_sea` takes arrays of latitudes and longitudes and returns the nearest
+sea name and haversine distance for every point. It does the same floating
+point operations in the same order as the JS function and picks the same sea
+on ties and NaN input as its `reduce`. The sea names match the browser exactly.
+V8's Math.sin/atan2 can differ from NumPy's in the last bit, so distances agree
+to within RELATIVE_TOLERANCE and are identical once formatted with toFixed(2)
+the way the page shows them.
+
+    python nearest_sea.py --benchmark 1000000
+"""
+import argparse
+import math
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+# Mirrors knownSeaCoordinates in src/NearestSeaPage.js
+KNOWN_SEA_COORDINATES = [
+    {"lat": 41.225, "lng": 29.1597, "name": "Black Sea"},
+    {"lat": 40.9631, "lng": 28.7224, "name": "Sea of Marmara"},
+    {"lat": 35.5501, "lng": 23.9871, "name": "Mediterranean Sea"},
+    {"lat": 34.559, "lng": 33.575, "name": "Eastern Mediterranean"},
+    {"lat": 38.4339, "lng": 27.1444, "name": "Aegean Sea"},
+]
+EARTH_RADIUS_KM = 6371
+RELATIVE_TOLERANCE = 1e-12
+
+
+def to_radians(degree):
+    return (degree * math.pi) / 180
+
+
+def haversine(lat, lng, sea_lat, sea_lng):
+    """Haversine distance in km, with the same operations in the same order as the JS.
+
+    Works on Python floats and NumPy arrays alike.
+    """
+    lat_distance = to_radians(sea_lat - lat)
+    lng_distance = to_radians(sea_lng - lng)
+    a = (
+        np.sin(lat_distance / 2) * np.sin(lat_distance / 2)
+        + np.cos(to_radians(lat)) * np.cos(to_radians(sea_lat)) * np.sin(lng_distance / 2) * np.sin(lng_distance / 2)
+    )
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def nearest_sea(lats, lngs, seas=KNOWN_SEA_COORDINATES):
+    """Return (names, distances) arrays with the nearest sea for every (lat, lng) pair."""
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    best_distance = np.full(lats.shape, np.nan)
+    best_index = np.zeros(lats.shape, dtype=np.intp)
+    with np.errstate(invalid="ignore"):
+        for index, sea in enumerate(seas):
+            distance = haversine(lats, lngs, sea["lat"], sea["lng"])
+            if index == 0:
+                best_distance = distance
+                continue
+            # reduce((prev, curr) => prev.distance < curr.distance ? prev : curr)
+            take = ~(best_distance < distance)
+            best_distance = np.where(take, distance, best_distance)
+            best_index = np.where(take, index, best_index)
+    names = np.array([sea["name"] for sea in seas], dtype=object)[best_index]
+    return names, best_distance
+
+
+def nearest_sea_scalar(lat, lng, seas=KNOWN_SEA_COORDINATES):
+    """Point-by-point reference, a line-for-line port of the JS function."""
+    if lat is None or lng is None:
+        return {"distance": math.nan, "name": ""}
+    distances = [{"distance": float(haversine(lat, lng, sea["lat"], sea["lng"])), "name": sea["name"]} for sea in seas]
+    nearest = distances[0]
+    for current in distances[1:]:
+        nearest = nearest if nearest["distance"] < current["distance"] else current
+    return nearest
+
+
+def to_fixed(value, digits=2):
+    """Format like JS Number.prototype.toFixed, which rounds exact halves away from zero."""
+    if math.isnan(value):
+        return "NaN"
+    return str(Decimal(value).quantize(Decimal(1).scaleb(-digits), rounding=ROUND_HALF_UP))
+
+
+def random_points(count, seed=0):
+    """Random GPS fixes, mostly around the seas in the table and some anywhere on Earth."""
+    rng = np.random.default_rng(seed)
+    local = count * 3 // 4
+    lats = np.concatenate([rng.uniform(30, 47, local), rng.uniform(-90, 90, count - local)])
+    lngs = np.concatenate([rng.uniform(18, 42, local), rng.uniform(-180, 180, count - local)])
+    return lats, lngs
+
+
+def benchmark(count):
+    lats, lngs = random_points(count)
+    start = time.perf_counter()
+    nearest_sea(lats, lngs)
+    vectorized = count / (time.perf_counter() - start)
+
+    sample = min(count, 100000)
+    start = time.perf_counter()
+    for lat, lng in zip(lats[:sample].tolist(), lngs[:sample].tolist()):
+        nearest_sea_scalar(lat, lng)
+    scalar = sample / (time.perf_counter() - start)
+    print(f"Vectorized: {vectorized:,.0f} points/s over {count:,} points")
+    print(f"Scalar:     {scalar:,.0f} points/s over {sample:,} points")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmark", type=int, default=1000000, metavar="POINTS")
+    args = parser.parse_args(argv)
+    benchmark(args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Offline stand-in for Google sign-in, for the app built with REACT_APP_OIDC_STUB_URL.
+
+It issues HS256-signed ID tokens with the claims LoginForm.handleGoogleLogin
+relies on (`email`, `email_verified`) plus the usual iss/aud/sub/iat/exp, so
+Google login tests need no network and no popup. Which Google account the
+browser is "signed in" with is kept in a cookie, like Google does, so browsers
+running in parallel each have their own account.
+
+    POST /session  {"email", "email_verified": true}  -> sets the browser's account cookie
+    GET  /token?client_id=...                          -> {"credential", "clientId", "select_by"} or 401
+
+    python oidc_stub.py --port 4001
+    python oidc_stub.py --benchmark 100000
+"""
+import argparse
+import hashlib
+import hmac
+import http.client
+import json
+import logging
+import secrets
+import sys
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from auth_server import b64decode, b64encode
+
+DEFAULT_PORT = 4001
+ISSUER = "https://accounts.google.com"
+# Mirrors GOOGLE_CLIENT_ID in src/GoogleLoginButton.js
+CLIENT_ID = "213591742347-23gmgjsok7p1siuukva9sm7gvofs757o.apps.googleusercontent.com"
+TOKEN_TTL = 3600  # seconds
+COOKIE_NAME = "oidc_stub_session"
+
+
+class TokenIssuer:
+    """Signs and verifies HS256 ID tokens."""
+
+    def __init__(self, secret=None, issuer=ISSUER, ttl=TOKEN_TTL):
+        self.secret = secret or secrets.token_bytes(32)
+        self.issuer = issuer
+        self.ttl = ttl
+        self.header = b64encode(json.dumps({"alg": "HS256", "typ": "JWT", "kid": "oidc-stub"}).encode())
+
+    def sign(self, signing_input):
+        return b64encode(hmac.new(self.secret, signing_input.encode(), hashlib.sha256).digest())
+
+    def issue(self, email, email_verified=True, audience=CLIENT_ID):
+        now = int(time.time())
+        claims = {
+            "iss": self.issuer,
+            "aud": audience,
+            "sub": hashlib.sha256(email.lower().encode()).hexdigest()[:21],
+            "email": email,
+            "email_verified": email_verified,
+            "iat": now,
+            "exp": now + self.ttl,
+        }
+        signing_input = f"{self.header}.{b64encode(json.dumps(claims).encode())}"
+        return f"{signing_input}.{self.sign(signing_input)}"
+
+    def verify(self, token):
+        """Return the claims of a token this issuer signed that has not expired, otherwise None."""
+        try:
+            header, payload, signature = token.split(".")
+        except (AttributeError, ValueError):
+            return None
+        if not hmac.compare_digest(self.sign(f"{header}.{payload}"), signature):
+            return None
+        claims = json.loads(b64decode(payload))
+        return claims if claims["exp"] > time.time() else None
+
+
+class OidcStubHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests and send small responses right away
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    issuer = None
+    accounts = None  # session cookie -> (email, email_verified)
+
+    def log_message(self, format, *args):
+        logging.debug(format, *args)
+
+    def send_cors_headers(self):
+        # Credentialed requests need the exact origin rather than "*"
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Vary", "Origin")
+
+    def send_json(self, status, body, cookie=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if cookie:
+            self.send_header("Set-Cookie", f"{COOKIE_NAME}={cookie}; Path=/; SameSite=Lax; HttpOnly")
+        self.send_cors_headers()
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.send_cors_headers()
+        self.end_headers()
+
+    def do_POST(self):
+        if self.path != "/session":
+            self.send_json(404, {"error": f"no endpoint {self.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": "invalid JSON"})
+            return
+        if not isinstance(body.get("email"), str):
+            self.send_json(400, {"error": "email is required"})
+            return
+        session = secrets.token_urlsafe(16)
+        self.accounts[session] = (body["email"], bool(body.get("email_verified", True)))
+        self.send_json(200, {"email": body["email"]}, cookie=session)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/token":
+            self.send_json(404, {"error": f"no endpoint {url.path}"})
+            return
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        account = self.accounts.get(cookie[COOKIE_NAME].value) if COOKIE_NAME in cookie else None
+        if account is None:
+            self.send_json(401, {"error": "not signed in"})
+            return
+        client_id = parse_qs(url.query).get("client_id", [CLIENT_ID])[0]
+        credential = self.issuer.issue(*account, audience=client_id)
+        # Same shape as the CredentialResponse @react-oauth/google passes to onSuccess
+        self.send_json(200, {"credential": credential, "clientId": client_id, "select_by": "btn"})
+
+
+def make_server(issuer=None, port=DEFAULT_PORT, host="localhost"):
+    handler = type("Handler", (OidcStubHandler,), {"issuer": issuer or TokenIssuer(), "accounts": {}})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def benchmark(count):
+    issuer = TokenIssuer()
+    start = time.perf_counter()
+    for i in range(count):
+        issuer.issue(f"user{i}@example.com")
+    elapsed = time.perf_counter() - start
+    print(f"Issued {count:,} tokens in-process: {count / elapsed:,.0f} tokens/s")
+
+    server = make_server(issuer, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection("localhost", server.server_address[1])
+    connection.request("POST", "/session", json.dumps({"email": "user@example.com"}), {"Content-Type": "application/json"})
+    response = connection.getresponse()
+    response.read()
+    cookie = response.getheader("Set-Cookie").split(";")[0]
+
+    requests = min(count, 10000)
+    start = time.perf_counter()
+    for _ in range(requests):
+        connection.request("GET", f"/token?client_id={CLIENT_ID}", headers={"Cookie": cookie})
+        response = connection.getresponse()
+        if issuer.verify(json.loads(response.read())["credential"]) is None:
+            raise RuntimeError("The stub issued a token it cannot verify")
+    elapsed = time.perf_counter() - start
+    print(f"Fetched {requests:,} tokens over one kept-alive connection: {requests / elapsed:,.0f} tokens/s, "
+          f"{elapsed / requests * 1000:.3f}ms each")
+    connection.close()
+    server.shutdown()
+    server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--benchmark", type=int, metavar="TOKENS", help="Measure token issuance throughput and exit")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+    server = make_server(port=args.port)
+    logging.info(f"OIDC stub on http://localhost:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(main())
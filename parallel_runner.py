@@ -0,0 +1,185 @@
+"""Run LoginTestCases sharded across worker processes, each with its own headless Chrome.
+
+Shards are balanced on the test durations recorded by previous runs, so a rerun
+with the same timings file always produces the same shard assignment.
+
+    python parallel_runner.py --workers 4
+"""
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import tracing
+
+TIMINGS_FILE = "selenium_timings.json"
+DEFAULT_TEST_TIME = 5.0  # seconds, used for tests that have never been timed
+
+
+def load_timings(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(path, timings):
+    with open(path, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+
+def assign_shards(test_names, timings, workers):
+    """Split tests into balanced shards, longest test first onto the least loaded shard."""
+    known = sorted(timings[name] for name in test_names if name in timings)
+    default = known[len(known) // 2] if known else DEFAULT_TEST_TIME
+    ordered = sorted(test_names, key=lambda name: (-timings.get(name, default), name))
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for name in ordered:
+        # Ties go to the lowest shard index so the assignment is deterministic
+        index = min(range(workers), key=lambda i: (loads[i], i))
+        shards[index].append(name)
+        loads[index] += timings.get(name, default)
+    return [sorted(shard) for shard in shards if shard]
+
+
+class TimedTestResult(unittest.TextTestResult):
+    """Text result that also records how long each test took."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = {}
+        self._started = {}
+
+    def startTest(self, test):
+        self._started[test.id()] = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.timings[test.id().rsplit(".", 1)[-1]] = time.perf_counter() - self._started.pop(test.id())
+
+
+def run_shard(index, test_names):
+    """Run one shard in this worker process and return its results as plain data."""
+    os.environ["SELENIUM_HEADLESS"] = "1"
+    if os.environ.get("SELENIUM_TRACE"):
+        # One trace file per shard, e.g. trace.json -> trace.shard0.json
+        root, extension = os.path.splitext(os.environ["SELENIUM_TRACE"])
+        os.environ["SELENIUM_TRACE"] = f"{root}.shard{index}{extension}"
+    import selenium_tests
+
+    # Collect this shard's log lines so they can be printed together in the merged report
+    log_stream = io.StringIO()
+    handler = logging.StreamHandler(log_stream)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+
+    output = io.StringIO()
+    result = TimedTestResult(output, descriptions=True, verbosity=2)
+    suite = unittest.TestSuite(selenium_tests.LoginTestCases(name) for name in test_names)
+    start = time.perf_counter()
+    suite.run(result)
+    elapsed = time.perf_counter() - start
+    # Pool workers do not run atexit handlers, so close the browser and trace here
+    selenium_tests.pool.close()
+    trace_totals = {}
+    if selenium_tests.tracer:
+        selenium_tests.tracer.write()
+        trace_totals = selenium_tests.tracer.totals
+
+    return {
+        "shard": index,
+        "tests": test_names,
+        "elapsed": elapsed,
+        "tests_run": result.testsRun,
+        "timings": result.timings,
+        "failures": [(test.id(), trace) for test, trace in result.failures],
+        "errors": [(test.id(), trace) for test, trace in result.errors],
+        "skipped": [(test.id(), reason) for test, reason in result.skipped],
+        "output": output.getvalue(),
+        "log": log_stream.getvalue(),
+        "trace_totals": trace_totals,
+    }
+
+
+def print_report(shard_results, wall_time):
+    failures = []
+    errors = []
+    tests_run = 0
+    for shard in shard_results:
+        print(f"===== Shard {shard['shard']} ({len(shard['tests'])} tests, {shard['elapsed']:.1f}s) =====")
+        print(shard["log"], end="")
+        print(shard["output"], end="")
+        tests_run += shard["tests_run"]
+        failures.extend(shard["failures"])
+        errors.extend(shard["errors"])
+    for kind, problems in (("FAIL", failures), ("ERROR", errors)):
+        for test_id, trace in problems:
+            print("=" * 70)
+            print(f"{kind}: {test_id}")
+            print("-" * 70)
+            print(trace)
+    print("-" * 70)
+    print(f"Ran {tests_run} tests in {wall_time:.3f}s across {len(shard_results)} shard(s)")
+    if failures or errors:
+        print(f"FAILED (failures={len(failures)}, errors={len(errors)})")
+    else:
+        print("OK")
+    return not (failures or errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", "-n", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--timings", default=TIMINGS_FILE, help="JSON file of per-test durations from previous runs")
+    parser.add_argument("-k", dest="pattern", help="Only run tests whose name contains this string")
+    args = parser.parse_args(argv)
+
+    import selenium_tests
+    test_names = unittest.TestLoader().getTestCaseNames(selenium_tests.LoginTestCases)
+    if args.pattern:
+        test_names = [name for name in test_names if args.pattern in name]
+    if not test_names:
+        print("No tests to run")
+        return 0
+
+    timings = load_timings(args.timings)
+    shards = assign_shards(test_names, timings, max(1, args.workers))
+
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    # A fresh process per shard: a worker that finished early must not take another shard and
+    # reuse the selenium_tests module it already imported, with that shard's pool and tracer
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context, max_tasks_per_child=1) as executor:
+        futures = [executor.submit(run_shard, index, shard) for index, shard in enumerate(shards)]
+        shard_results = [future.result() for future in futures]
+    wall_time = time.perf_counter() - start
+
+    for shard in shard_results:
+        timings.update(shard["timings"])
+    save_timings(args.timings, timings)
+    passed = print_report(shard_results, wall_time)
+
+    # Rank the slowest traced steps across all shards
+    totals = {}
+    for shard in shard_results:
+        for name, (calls, total, longest) in shard["trace_totals"].items():
+            merged = totals.setdefault(name, [0, 0.0, 0.0])
+            merged[0] += calls
+            merged[1] += total
+            merged[2] = max(merged[2], longest)
+    tracing.log_slowest(totals)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""Check the app's pure JS functions against Python references in one browser call.
+
+A build made with REACT_APP_TEST_HOOKS=true puts parseFloat, validateCoordinates,
+validateEmail, solarDistanceCalculator and calculateDistanceToNearestSea on
+window.__pure (src/testHooks.js). `random_cases` generates tens of thousands of
+inputs per function, mixing well-formed values with the awkward ones (stray
+whitespace, exponents, Unicode digits, boundary coordinates, trailing newlines
+in emails). `run_parity` sends every case in a single execute_script and
+compares each result with its reference here:
+
+    parseFloat             parse_float, the ECMAScript grammar for it
+    validateCoordinates    validate_coordinates, a line-for-line port
+    validateEmail          validate_email, the same regex with ASCII \\w and no
+                           match before a trailing newline, like JS
+    solarDistanceCalculator   solar_distance.simplified
+    calculateDistanceToNearestSea   nearest_sea.nearest_sea
+
+validateCoordinates gets the numbers parse_float makes of the generated text,
+which is what the sun page passes it. Distances agree to within
+RELATIVE_TOLERANCE, as in solar_distance.py and nearest_sea.py.
+
+    python parity.py --cases 20000 --seed 1
+"""
+import argparse
+import logging
+import math
+import random
+import re
+import sys
+import time
+
+import nearest_sea
+import solar_distance
+
+DEFAULT_CASES = 20000
+RELATIVE_TOLERANCE = 1e-12
+
+# StrWhiteSpaceChar: WhiteSpace (including every Zs space) and LineTerminator
+JS_WHITESPACE = (
+    "\t\n\x0b\x0c\r \xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000\ufeff"
+)
+# StrDecimalLiteral; JS digits are ASCII only, unlike Python's float()
+DECIMAL_PREFIX = re.compile(r"[+-]?(?:Infinity|(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?)")
+# /^[\w-\.]+@([\w-]+\.)+[\w-]{2,4}$/ from src/validators.js
+EMAIL_PATTERN = re.compile(r"[\w\-.]+@([\w-]+\.)+[\w-]{2,4}", re.ASCII)
+
+
+def parse_float(text):
+    """JS parseFloat: the longest decimal prefix after leading whitespace, NaN if there is none."""
+    match = DECIMAL_PREFIX.match(text.lstrip(JS_WHITESPACE))
+    if match is None:
+        return math.nan
+    return float(match.group().replace("Infinity", "inf"))
+
+
+def validate_coordinates(lat, lng):
+    if math.isnan(lat) or math.isnan(lng):
+        return "Coordinates must be numeric."
+    if lat < -90 or lat > 90:
+        return "Latitude must be between -90 and 90 degrees."
+    if lng < -180 or lng > 180:
+        return "Longitude must be between -180 and 180 degrees."
+    return ""
+
+
+def validate_email(email):
+    return EMAIL_PATTERN.fullmatch(email) is not None
+
+
+def encode(value):
+    """Python value to its JSON form for src/testHooks.js, with non-finite floats and -0 tagged."""
+    if isinstance(value, float) and (not math.isfinite(value) or (value == 0 and math.copysign(1, value) < 0)):
+        return {"$number": "-0" if value == 0 else {math.inf: "Infinity", -math.inf: "-Infinity"}.get(value, "NaN")}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    return value
+
+
+def decode(value):
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if isinstance(value, dict):
+        if "$number" in value:
+            return float(value["$number"])
+        return {key: decode(item) for key, item in value.items()}
+    return value
+
+
+def same_number(actual, expected, tolerance=0.0):
+    """Equal floats, NaN matching NaN. Without a tolerance the sign of zero must match too."""
+    if not isinstance(actual, (int, float)) or isinstance(actual, bool):
+        return False
+    if math.isnan(expected) or math.isnan(actual):
+        return math.isnan(expected) and math.isnan(actual)
+    if tolerance:
+        return math.isclose(actual, expected, rel_tol=tolerance)
+    return actual == expected and math.copysign(1, actual) == math.copysign(1, expected)
+
+
+def number_text(rng):
+    """Text someone could type into a coordinate field, mostly numbers and often not quite."""
+    kind = rng.randrange(6)
+    value = rng.uniform(-200, 200)
+    if kind == 0:
+        text = repr(value)
+    elif kind == 1:
+        text = f"{value:.{rng.randrange(8)}f}"
+    elif kind == 2:
+        text = f"{value:{rng.choice('eE')}}"
+    elif kind == 3:
+        text = rng.choice(["90", "-90", "180", "-180", "90.0000000001", "-180.00000001", "0", "-0", "+0", "89.99999999999999"])
+    elif kind == 4:
+        text = rng.choice([
+            "", ".", "-", "+", "e5", ".5", "5.", "+.5e-3", "1e", "1e+", "1.2.3", "--1", "0x1A", "1_000", "1,5",
+            "Infinity", "-Infinity", "+Infinity", "infinity", "Inf", "NaN", "1e400", "-1e400", "1e-400",
+            "١٢", "１２", "12½", "abc",
+        ])
+    else:
+        text = "".join(rng.choice("0123456789.eE+- ") for _ in range(rng.randrange(1, 8)))
+    # Leading whitespace parseFloat skips, or characters it does not treat as whitespace
+    if rng.random() < 0.3:
+        text = "".join(rng.choice(JS_WHITESPACE + "\x1c\x85\u200b") for _ in range(rng.randrange(1, 3))) + text
+    if rng.random() < 0.2:
+        text += rng.choice([" ", "km", "°", "e", ".0", "x"])
+    return text
+
+
+def email_text(rng):
+    """An email address, valid or broken in one of the ways the regex cares about."""
+    alphabet = "abcxyzABCXYZ0189_-."
+    awkward = "+@ !éü中ıK"
+
+    def part(low, high):
+        return "".join(
+            rng.choice(awkward if rng.random() < 0.05 else alphabet) for _ in range(rng.randrange(low, high))
+        )
+
+    if rng.random() < 0.05:
+        return rng.choice([
+            "name@mail.com", "validationtest542@gmail.com", "a@b.co", "a@b.c", "a@b.abcde", "a@@b.com",
+            "a@b.com\n", "\na@b.com", " a@b.com", "a@b..com", "a@.com", "@b.com", "a@b_c.d_e", "-@-.--", "",
+        ])
+    labels = ".".join(part(0, 6) for _ in range(rng.randrange(1, 4)))
+    email = f"{part(0, 10)}@{labels}.{part(1, 6)}"
+    if rng.random() < 0.05:
+        email += rng.choice(["\n", " ", "\r\n", "@x.com"])
+    return email
+
+
+def coordinate(rng, limit):
+    kind = rng.randrange(5)
+    if kind == 0:
+        return rng.choice([limit, -limit, 0.0, -0.0, math.nextafter(limit, math.inf), math.nextafter(-limit, -math.inf)])
+    if kind == 1:
+        return rng.choice([math.nan, math.inf, -math.inf])
+    return rng.uniform(-1.1 * limit, 1.1 * limit)
+
+
+def random_cases(count, seed=0):
+    """`count` argument lists per function, keyed on the names in window.__pure.functions."""
+    rng = random.Random(seed)
+    texts = [(number_text(rng), number_text(rng)) for _ in range(count)]
+    lats, lngs = nearest_sea.random_points(count, seed=seed)
+    return {
+        "parseFloat": [[number_text(rng)] for _ in range(count)],
+        # What the sun page passes on: parseFloat of each field
+        "validateCoordinates": [[parse_float(lat), parse_float(lng)] for lat, lng in texts],
+        "validateEmail": [[email_text(rng)] for _ in range(count)],
+        "solarDistanceCalculator": [[{"lat": coordinate(rng, 90), "lng": coordinate(rng, 180)}] for _ in range(count)],
+        # Positions a GPS can report
+        "calculateDistanceToNearestSea": [[{"lat": lat, "lng": lng}] for lat, lng in zip(lats.tolist(), lngs.tolist())],
+    }
+
+
+def expected_results(cases):
+    """The Python reference's result for every case, in the same shape as the browser's."""
+    solar_args = [args[0] for args in cases["solarDistanceCalculator"]]
+    sea_args = [args[0] for args in cases["calculateDistanceToNearestSea"]]
+    names, distances = nearest_sea.nearest_sea([c["lat"] for c in sea_args], [c["lng"] for c in sea_args])
+    return {
+        "parseFloat": [parse_float(text) for text, in cases["parseFloat"]],
+        "validateCoordinates": [validate_coordinates(*args) for args in cases["validateCoordinates"]],
+        "validateEmail": [validate_email(email) for email, in cases["validateEmail"]],
+        "solarDistanceCalculator": solar_distance.simplified(
+            [c["lat"] for c in solar_args], [c["lng"] for c in solar_args]
+        ).tolist(),
+        "calculateDistanceToNearestSea": [
+            {"name": name, "distance": distance} for name, distance in zip(names.tolist(), distances.tolist())
+        ],
+    }
+
+
+def matches(name, actual, expected):
+    if name == "parseFloat":
+        return same_number(actual, expected)
+    if name == "solarDistanceCalculator":
+        return same_number(actual, expected, RELATIVE_TOLERANCE)
+    if name == "calculateDistanceToNearestSea":
+        return (
+            isinstance(actual, dict)
+            and actual.get("name") == expected["name"]
+            and same_number(actual.get("distance"), expected["distance"], RELATIVE_TOLERANCE)
+        )
+    return actual == expected and type(actual) is type(expected)
+
+
+def run_parity(driver, cases):
+    """Evaluate every case in the browser with one execute_script and compare with the references.
+
+    Returns {name: {"cases", "mismatches", "browser_ms"}} and the round trip in seconds.
+    """
+    expected = expected_results(cases)
+    start = time.perf_counter()
+    report = driver.execute_script("return window.__pure.run(arguments[0]);", encode(cases))
+    round_trip = time.perf_counter() - start
+    results = {}
+    for name, batch in cases.items():
+        actual = decode(report[name]["results"])
+        mismatches = [
+            (args, value, reference)
+            for args, value, reference in zip(batch, actual, expected[name])
+            if not matches(name, value, reference)
+        ]
+        results[name] = {"cases": len(batch), "mismatches": mismatches, "browser_ms": report[name]["elapsedMs"]}
+    return results, round_trip
+
+
+def log_parity(results, round_trip):
+    total = sum(result["cases"] for result in results.values())
+    for name, result in results.items():
+        rate = result["cases"] / (result["browser_ms"] / 1000) if result["browser_ms"] else math.inf
+        logging.info(
+            f"{name}: {result['cases']} cases, {len(result['mismatches'])} mismatches, "
+            f"{rate:,.0f} cases/s in the browser"
+        )
+        for args, value, reference in result["mismatches"][:10]:
+            logging.info(f"  {name}({', '.join(map(repr, args))}): browser {value!r}, python {reference!r}")
+    logging.info(f"{total} cases in one round trip of {round_trip:.2f}s, {total / round_trip:,.0f} cases/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help="Cases per function")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from driver_pool import pool
+    from waits import Waiter
+
+    driver = pool.acquire()
+    Waiter(driver).until("return !!window.__pure;", "test hooks (build with REACT_APP_TEST_HOOKS=true)")
+    results, round_trip = run_parity(driver, random_cases(args.cases, args.seed))
+    log_parity(results, round_trip)
+    return 1 if any(result["mismatches"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    sys.exit(main())
@@ -0,0 +1,57 @@
+// Compares the k-d tree sea index with the linear haversine scan.
+// Usage: npm run bench:sea-index
+import { readFile } from "node:fs/promises";
+
+// src/ is compiled by react-scripts and has no "type": "module", so load the
+// module from its source to run it under plain node
+const source = await readFile(new URL("../src/seaIndex.js", import.meta.url), "utf8");
+const { buildSeaIndex, linearNearestSea } = await import(
+  `data:text/javascript,${encodeURIComponent(source)}`
+);
+
+const QUERIES = 500;
+
+// Deterministic pseudo-random numbers so runs are comparable
+let seed = 1;
+const random = () => {
+  seed = (seed * 16807) % 2147483647;
+  return (seed - 1) / 2147483646;
+};
+
+const randomPoint = () => ({
+  lat: (Math.asin(2 * random() - 1) * 180) / Math.PI,
+  lng: random() * 360 - 180,
+});
+
+const timePerQuery = (queries, lookup) => {
+  const start = performance.now();
+  const results = queries.map(lookup);
+  return [((performance.now() - start) * 1000) / queries.length, results];
+};
+
+const queries = Array.from({ length: QUERIES }, randomPoint);
+
+for (const size of [5, 1000, 10000, 100000]) {
+  const seas = Array.from({ length: size }, (_, i) => ({
+    ...randomPoint(),
+    name: `Sea ${i}`,
+  }));
+  const buildStart = performance.now();
+  const index = buildSeaIndex(seas);
+  const buildTime = performance.now() - buildStart;
+
+  const [linear, expected] = timePerQuery(queries, (query) =>
+    linearNearestSea(seas, query)
+  );
+  const [indexed, results] = timePerQuery(queries, (query) =>
+    index.nearest(query)
+  );
+  const mismatches = results.filter(
+    (result, i) => result.name !== expected[i].name
+  ).length;
+  console.log(
+    `${String(size).padStart(6)} seas: linear ${linear.toFixed(2)} us/query, ` +
+      `index ${indexed.toFixed(2)} us/query (${(linear / indexed).toFixed(1)}x), ` +
+      `build ${buildTime.toFixed(1)} ms, ${mismatches} mismatches`
+  );
+}
@@ -0,0 +1,83 @@
+// Compares the per-call cost of the date-aware solar distance with the
+// simplified formula and with solving Kepler's equation on every call.
+// Usage: npm run bench:solar
+import { readFile } from "node:fs/promises";
+
+// src/ is compiled by react-scripts and has no "type": "module", so load the
+// modules from their source to run them under plain node
+const load = async (file, replacements = {}) => {
+  let source = await readFile(new URL(`../src/${file}`, import.meta.url), "utf8");
+  for (const [from, to] of Object.entries(replacements)) {
+    source = source.replace(from, to);
+  }
+  return `data:text/javascript,${encodeURIComponent(source)}`;
+};
+
+const ephemerisUrl = await load("ephemeris.js");
+const { AU_KM, ECCENTRICITY, solveKepler, sunPosition } = await import(
+  ephemerisUrl
+);
+const { preciseSolarDistance, solarDistanceCalculator } = await import(
+  await load("solarDistance.js", { '"./ephemeris"': `"${ephemerisUrl}"` })
+);
+
+const CALLS = 1000000;
+const J2000_MS = Date.UTC(2000, 0, 1, 12);
+
+// Deterministic pseudo-random numbers so runs are comparable
+let seed = 1;
+const random = () => {
+  seed = (seed * 16807) % 2147483647;
+  return (seed - 1) / 2147483646;
+};
+
+const inputs = Array.from({ length: CALLS }, () => ({
+  coords: { lat: random() * 180 - 90, lng: random() * 360 - 180 },
+  // Any minute between 1950 and 2100
+  timestamp:
+    Math.floor((Date.UTC(1950, 0) + random() * 4733596800000) / 60000) * 60000,
+}));
+
+// The distance part of the model without the table: Kepler solved per call
+const solvedDistance = (timestamp) => {
+  const days = (timestamp - J2000_MS) / 86400000;
+  const M = (((357.52911 + 0.98560028 * days) * Math.PI) / 180) % (2 * Math.PI);
+  return 1.000001018 * (1 - ECCENTRICITY * Math.cos(solveKepler(M))) * AU_KM;
+};
+
+const nsPerCall = (call) => {
+  let sink = 0;
+  const start = performance.now();
+  for (const input of inputs) sink += call(input);
+  const elapsed = performance.now() - start;
+  if (Number.isNaN(sink)) console.log("NaN result");
+  return (elapsed * 1e6) / CALLS;
+};
+
+// Warm up so every variant runs optimized
+for (let i = 0; i < 3; i++) {
+  nsPerCall(({ coords }) => solarDistanceCalculator(coords));
+  nsPerCall(({ coords, timestamp }) => preciseSolarDistance(coords, timestamp));
+  nsPerCall(({ timestamp }) => solvedDistance(timestamp));
+}
+
+const simplified = nsPerCall(({ coords }) => solarDistanceCalculator(coords));
+const precise = nsPerCall(({ coords, timestamp }) =>
+  preciseSolarDistance(coords, timestamp)
+);
+const tableLookup = nsPerCall(({ timestamp }) => sunPosition(timestamp).distance);
+const solved = nsPerCall(({ timestamp }) => solvedDistance(timestamp));
+
+let maxError = 0;
+for (const { timestamp } of inputs.slice(0, 100000)) {
+  maxError = Math.max(
+    maxError,
+    Math.abs(sunPosition(timestamp).distance - solvedDistance(timestamp))
+  );
+}
+
+console.log(`simplified formula:       ${simplified.toFixed(1)} ns/call`);
+console.log(`precise (table + WGS84):  ${precise.toFixed(1)} ns/call`);
+console.log(`sun position from table:  ${tableLookup.toFixed(1)} ns/call`);
+console.log(`Earth-Sun distance, Kepler solved per call: ${solved.toFixed(1)} ns/call`);
+console.log(`table vs solved distance: max error ${maxError.toFixed(3)} km`);
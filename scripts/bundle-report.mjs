@@ -0,0 +1,52 @@
+// Reports the size of every chunk in build/ and checks the first-load budget.
+// Usage: npm run analyze   (builds first)
+//        BUNDLE_BUDGET_KB=200 node scripts/bundle-report.mjs
+import { readFile, writeFile } from "node:fs/promises";
+import { gzipSync } from "node:zlib";
+
+const buildDir = new URL("../build/", import.meta.url);
+const budgetKb = Number(process.env.BUNDLE_BUDGET_KB) || 250;
+
+const manifest = JSON.parse(
+  await readFile(new URL("asset-manifest.json", buildDir), "utf8")
+);
+// Files the browser needs before the login screen can render
+const initial = new Set(manifest.entrypoints);
+
+const assets = [];
+for (const file of Object.values(manifest.files)) {
+  if (!/\.(js|css)$/.test(file)) continue;
+  const contents = await readFile(new URL(`.${file}`, buildDir));
+  const path = file.replace(/^\//, "");
+  assets.push({
+    file: path,
+    bytes: contents.length,
+    gzipBytes: gzipSync(contents).length,
+    initial: initial.has(path),
+  });
+}
+assets.sort((a, b) => b.gzipBytes - a.gzipBytes);
+
+const kb = (bytes) => (bytes / 1024).toFixed(1);
+for (const asset of assets) {
+  console.log(
+    `${kb(asset.gzipBytes).padStart(8)} kB gzip ${kb(asset.bytes).padStart(
+      8
+    )} kB  ${asset.initial ? "initial" : "lazy   "}  ${asset.file}`
+  );
+}
+const initialGzip = assets
+  .filter((asset) => asset.initial)
+  .reduce((sum, asset) => sum + asset.gzipBytes, 0);
+console.log(
+  `First load: ${kb(initialGzip)} kB gzip (budget ${budgetKb} kB)`
+);
+
+await writeFile(
+  new URL("bundle-report.json", buildDir),
+  JSON.stringify({ budgetKb, initialGzipBytes: initialGzip, assets }, null, 2)
+);
+if (initialGzip > budgetKb * 1024) {
+  console.error("First-load bundle is over budget");
+  process.exit(1);
+}
@@ -0,0 +1,173 @@
+"""Python mirror of the k-d tree sea index in src/seaIndex.js.
+
+Builds the same tree as the app (unit vectors, split on the widest axis,
+median nodes), so the selenium checks can assert on the sea the page picks
+for any coastline dataset.
+
+    python sea_index.py --benchmark
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from nearest_sea import KNOWN_SEA_COORDINATES, haversine, to_radians
+
+# Mirrors TIE_TOLERANCE in src/seaIndex.js
+TIE_TOLERANCE = 1e-9
+
+
+def to_unit_vectors(lats, lngs):
+    phi = to_radians(np.asarray(lats, dtype=np.float64))
+    lam = to_radians(np.asarray(lngs, dtype=np.float64))
+    return np.stack([np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)], axis=-1)
+
+
+class SeaIndex:
+    """Nearest-sea lookups in O(log n) over a list of {"lat", "lng", "name"} points."""
+
+    def __init__(self, seas):
+        self.seas = list(seas)
+        count = len(self.seas)
+        self.points = to_unit_vectors([sea["lat"] for sea in self.seas], [sea["lng"] for sea in self.seas])
+        self.order = np.arange(count)
+        self.axes = np.zeros(count, dtype=np.intp)
+        self._build(0, count)
+        # Plain lists are much faster than NumPy scalars in the query loop
+        self._order = self.order.tolist()
+        self._axes = self.axes.tolist()
+        self._points = self.points.tolist()
+
+    def _build(self, lo, hi):
+        if hi - lo < 2:
+            return
+        block = self.order[lo:hi]
+        values = self.points[block]
+        axis = int(np.argmax(values.max(axis=0) - values.min(axis=0)))
+        # Sort on the axis and then on the sea's position, like the JS comparator
+        self.order[lo:hi] = block[np.lexsort((block, values[:, axis]))]
+        mid = (lo + hi) >> 1
+        self.axes[mid] = axis
+        self._build(lo, mid)
+        self._build(mid + 1, hi)
+
+    def nearest(self, lat, lng):
+        """Return {"distance": km, "name": sea} for the sea nearest to (lat, lng)."""
+        if lat is None or lng is None:
+            return {"distance": math.nan, "name": ""}
+        if not self.seas or not math.isfinite(lat) or not math.isfinite(lng):
+            # Same result as the linear scan, whose reduce ends on the last sea
+            return {"distance": math.nan, "name": self.seas[-1]["name"] if self.seas else ""}
+        query = to_unit_vectors(lat, lng).tolist()
+        best = [-1, math.inf]
+        self._search(query, 0, len(self.seas), best)
+        # Settle near-ties like the linear scan: in the original order, a sea
+        # replaces the nearest so far unless that one is strictly closer
+        candidates = []
+        self._collect(query, 0, len(self.seas), best[1] * (1 + TIE_TOLERANCE), candidates)
+        result = None
+        for index in sorted(candidates):
+            sea = self.seas[index]
+            distance = float(haversine(lat, lng, sea["lat"], sea["lng"]))
+            if not (result and result["distance"] < distance):
+                result = {"distance": distance, "name": sea["name"]}
+        return result
+
+    def _search(self, query, lo, hi, best):
+        if lo >= hi:
+            return
+        mid = (lo + hi) >> 1
+        index = self._order[mid]
+        point = self._points[index]
+        dx = query[0] - point[0]
+        dy = query[1] - point[1]
+        dz = query[2] - point[2]
+        distance = dx * dx + dy * dy + dz * dz
+        if distance < best[1]:
+            best[0] = index
+            best[1] = distance
+        axis = self._axes[mid]
+        diff = query[axis] - point[axis]
+        if diff < 0:
+            self._search(query, lo, mid, best)
+            if diff * diff < best[1]:
+                self._search(query, mid + 1, hi, best)
+        else:
+            self._search(query, mid + 1, hi, best)
+            if diff * diff < best[1]:
+                self._search(query, lo, mid, best)
+
+    def _collect(self, query, lo, hi, limit, candidates):
+        """Add every sea within `limit` (squared chord distance) of the query to `candidates`."""
+        if lo >= hi:
+            return
+        mid = (lo + hi) >> 1
+        index = self._order[mid]
+        point = self._points[index]
+        dx = query[0] - point[0]
+        dy = query[1] - point[1]
+        dz = query[2] - point[2]
+        if dx * dx + dy * dy + dz * dz <= limit:
+            candidates.append(index)
+        axis = self._axes[mid]
+        diff = query[axis] - point[axis]
+        if diff < 0:
+            self._collect(query, lo, mid, limit, candidates)
+            if diff * diff <= limit:
+                self._collect(query, mid + 1, hi, limit, candidates)
+        else:
+            self._collect(query, mid + 1, hi, limit, candidates)
+            if diff * diff <= limit:
+                self._collect(query, lo, mid, limit, candidates)
+
+
+KNOWN_SEA_INDEX = SeaIndex(KNOWN_SEA_COORDINATES)
+
+
+def random_seas(count, seed=0):
+    """Sea points spread uniformly over the sphere, standing in for a coastline dataset."""
+    rng = np.random.default_rng(seed)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+    lngs = rng.uniform(-180, 180, count)
+    return [{"lat": lat, "lng": lng, "name": f"Sea {i}"} for i, (lat, lng) in enumerate(zip(lats.tolist(), lngs.tolist()))]
+
+
+def benchmark(queries=500):
+    rng = np.random.default_rng(1)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, queries))).tolist()
+    lngs = rng.uniform(-180, 180, queries).tolist()
+    for size in (5, 1000, 10000, 100000):
+        seas = random_seas(size)
+        start = time.perf_counter()
+        index = SeaIndex(seas)
+        build = time.perf_counter() - start
+
+        sea_lats = np.array([sea["lat"] for sea in seas])
+        sea_lngs = np.array([sea["lng"] for sea in seas])
+        names = [sea["name"] for sea in seas]
+        start = time.perf_counter()
+        # Linear scan, vectorized over all seas for each query
+        expected = [names[int(np.argmin(haversine(lat, lng, sea_lats, sea_lngs)))] for lat, lng in zip(lats, lngs)]
+        linear = (time.perf_counter() - start) / queries * 1e6
+        start = time.perf_counter()
+        results = [index.nearest(lat, lng)["name"] for lat, lng in zip(lats, lngs)]
+        indexed = (time.perf_counter() - start) / queries * 1e6
+        mismatches = sum(1 for a, b in zip(expected, results) if a != b)
+        print(
+            f"{size:>6} seas: linear {linear:.1f} us/query, index {indexed:.1f} us/query "
+            f"({linear / indexed:.1f}x), build {build * 1000:.1f} ms, {mismatches} mismatches"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark(args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
 import unittest
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.keys import Keys
+import os
 import time
 import logging
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
+import contextlib
+import auth_server
+import benchmark
+import geo_matrix
+import nearest_sea
+import parity
+import sea_index
+import solar_distance
+import tracing
+from driver_pool import BASE_URL, pool
+from login_fixtures import (
+    AUTH_URL, OIDC_STUB_URL, login_through_form, login_through_storage, report_login_timings, seed_users,
+    sign_in_to_oidc_stub,
+)
+from waits import Waiter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -16,17 +29,50 @@ TEST_PASSWORD = "password"
 GOOGLE_EMAIL = "validationtest542@gmail.com"
 GOOGLE_PASSWORD = "thiswillwork"
 
+# Mean React render time allowed per commit, one frame at 60fps by default
+RENDER_BUDGET_MS = float(os.environ.get("RENDER_BUDGET_MS", "16"))
+
+# Set SELENIUM_TRACE=trace.json to record every driver call as a Chrome trace
+tracer = tracing.tracer_from_env()
+
 class LoginTestCases(unittest.TestCase):
 
+    @classmethod
+    def tearDownClass(cls):
+        report_login_timings()
+
     def setUp(self):
-        # Initialize webdriver and open the web page
-        self.driver = webdriver.Chrome()
-        self.driver.get("http://localhost:3000")
+        # Borrow the worker's shared browser on the web page, unless the test needs its own
+        self.own_browser = getattr(getattr(self, self._testMethodName), "fresh_browser", False)
+        # The shared browser's reset is recorded as this test's setup
+        setup = tracer.span("browser setup", "setup", test=self._testMethodName) if tracer else contextlib.nullcontext()
+        with setup:
+            self.driver = pool.new_driver() if self.own_browser else pool.acquire()
+        self.trace = contextlib.ExitStack()
+        if tracer:
+            tracing.instrument(self.driver, tracer)
+            self.trace.enter_context(tracer.span(self._testMethodName, "test"))
+        self.wait = Waiter(self.driver)
         self.pages = {
-            "login": "http://localhost:3000/login",
-            "distance_to_sun": "http://localhost:3000/distance-to-sun",
-            "nearest_sea": "http://localhost:3000/nearest-sea"
+            "login": BASE_URL + benchmark.PAGES["login"],  # LoginForm is mounted at "/"
+            "distance_to_sun": f"{BASE_URL}/distance-to-sun",
+            "nearest_sea": f"{BASE_URL}/nearest-sea"
         }
+
+    def login(self, url):
+        """Log in with the test account without the login form and open `url`."""
+        login_through_storage(self.driver, BASE_URL, url, TEST_EMAIL, TEST_PASSWORD)
+
+    def require_test_hook(self, name):
+        """Skip unless the app was built with REACT_APP_TEST_HOOKS=true and exposes window.<name>."""
+        try:
+            self.wait.until(f"return !!window.{name};", f"test hook {name}", timeout=5)
+        except TimeoutException:
+            self.skipTest(f"Build the app with REACT_APP_TEST_HOOKS=true to expose window.{name}")
+
+    def login_with_form(self, email=TEST_EMAIL, password=TEST_PASSWORD):
+        """Log in through the login form, for tests that cover LoginForm itself."""
+        login_through_form(self.driver, self.wait, email, password)
         
     # def test_invalid_credentials_direct_login(self):
     #     """Test direct login with invalid credentials and verify error message."""
@@ -68,10 +114,7 @@ class LoginTestCases(unittest.TestCase):
     # def test_valid_credentials_direct_login(self):
     #     """Use valid credentials for direct login and ensure successful redirection."""
     #     logging.info("Test: Valid Credentials Direct Login")
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login_with_form()
     #     result = "distance-to-sun" in self.driver.current_url
     #     logging.info(f"Test Result: {'Success' if result else 'Failure'}")
     #     self.assertTrue(result)
@@ -80,10 +123,7 @@ class LoginTestCases(unittest.TestCase):
     #     """Test that the app retrieves and displays GPS coordinates and calculates distance when location services are enabled."""
     #     logging.info("Test: Location Enabled")
     #     try:
-    #         self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #         self.driver.find_element(By.ID, "password").send_keys("password")
-    #         self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #         self.driver.get("http://localhost:3000/nearest-sea")
+    #         self.login(self.pages["nearest_sea"])
     #         coordinates_display = WebDriverWait(self.driver, 10).until(
     #             EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'Your GPS Coordinates')]"))
     #         )
@@ -97,34 +137,19 @@ class LoginTestCases(unittest.TestCase):
     # def test_location_disabled(self):
     #     """Test that the app provides a specific error message when location services are disabled."""
     #     logging.info("Test: Location Disabled")
-        
-    #     # Set up Chrome options to disable geolocation specifically for this test
-    #     chrome_options = Options()
-    #     chrome_options.add_experimental_option("prefs", {
-    #         "profile.default_content_setting_values.geolocation": 2,  # Block geolocation
-    #     })
 
-    #     # Reinitialize the driver with these options
-    #     self.driver.quit()  # First, close the existing driver
-    #     self.driver = webdriver.Chrome(options=chrome_options)
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     self.driver.get("http://localhost:3000/nearest-sea")
+    #     # Block geolocation for this origin instead of restarting Chrome with blocking prefs
+    #     geo_matrix.set_permission(self.driver, BASE_URL, "denied")
+    #     self.login(self.pages["nearest_sea"])
 
     #     # Check for the presence of the error message
-    #     error_message = WebDriverWait(self.driver, 10).until(
-    #         EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'Enable GPS and Try Again')]"))
-    #     )
+    #     error_message = self.wait.for_visible("//*[contains(text(), 'Enable GPS and Try Again')]")
     #     self.assertTrue(error_message.is_displayed(), "GPS disable error message was not displayed")
 
     # def test_distance_calculation_accuracy(self):
     #     """Check if the calculated distance changes and is correct after changing location."""
         
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     self.driver.get("http://localhost:3000/nearest-sea")
+    #     self.login(self.pages["nearest_sea"])
         
     #     initial_distance = WebDriverWait(self.driver, 10).until(
     #         EC.visibility_of_element_located((By.XPATH, "//div[contains(text(), 'Distance:')]"))
@@ -151,79 +176,287 @@ class LoginTestCases(unittest.TestCase):
     #     logging.info("Test: Direct Access to Nearest Sea Without Login")
         
     #     self.driver.get("http://localhost:3000/nearest-sea")
-    #     # Expecting some form of redirect or warning, not direct access to page content.
-    #     try:
-    #         element = WebDriverWait(self.driver, 10).until(
-    #             EC.presence_of_element_located((By.TAG_NAME, "h5"))
-    #         )
-    #         self.assertIn("Welcome", element.text)
-    #         self.assertTrue(False, "Was not supposed to have direct access without login.")
-    #     except TimeoutException:
-    #         logging.info("Properly redirected or blocked, no direct access without login.")
-    #         self.assertTrue(True)
+    #     # Expecting a redirect to the login page, not direct access to page content.
+    #     self.wait.for_route("/")
+    #     self.assertFalse(self.driver.find_elements(By.XPATH, "//h5[contains(text(), 'Welcome')]"),
+    #                      "Was not supposed to have direct access without login.")
+    #     logging.info("Properly redirected or blocked, no direct access without login.")
             
     def test_direct_access_distance_to_sun(self):
         """Attempt to navigate directly to /distance-to-sun without logging in and verify access denial."""
         logging.info("Test: Direct Access to Distance to Sun Page Without Login")
         
-        self.driver.get("http://localhost:3000/distance-to-sun")
-        # Expecting some form of redirect or warning, not direct access to page content.
-        try:
-            error = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, "//div[contains(@class, 'MuiAlert-message') and contains(text(), 'Login before accessing the application Page')]"))
+        # Keep the alert from blocking the redirect behind it
+        with self.wait.capture_alerts():
+            self.driver.get(self.pages["distance_to_sun"])
+            # ProtectedRoute alerts and redirects to the login page, so decide on that redirect instead of a timeout
+            self.wait.for_route("/")
+            self.assertTrue(self.wait.alerted("Login before accessing the application Page"))
+        errors = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'MuiAlert-message') and contains(text(), 'Login before accessing the application Page')]")
+        self.assertFalse(errors, "Login before accessing the application Page")
+        logging.info("Properly redirected or blocked, no direct access without login.")
+
+    def test_reset_clears_browser_storage(self):
+        """Resetting the shared browser must leave no localStorage or sessionStorage behind for the next test."""
+        logging.info("Test: Reset Clears Browser Storage")
+        self.driver.execute_script("localStorage.setItem('resetCheck', '1'); sessionStorage.setItem('resetCheck', '1');")
+        pool.reset(self.driver)
+        left = self.driver.execute_script(
+            "return [localStorage.getItem('resetCheck'), sessionStorage.getItem('resetCheck')];"
+        )
+        self.assertEqual(left, [None, None], "Storage survived the browser reset")
+
+    def test_nearest_sea_matches_python_engine(self):
+        """Compare the distance and sea shown by /nearest-sea with the Python engine on sampled coordinates."""
+        logging.info("Test: Nearest Sea Matches Python Engine")
+        samples = int(os.environ.get("NEAREST_SEA_SAMPLES", "20"))
+        lats, lngs = nearest_sea.random_points(samples, seed=int(os.environ.get("NEAREST_SEA_SEED", "0")))
+        names, distances = nearest_sea.nearest_sea(lats, lngs)
+        self.driver.execute_cdp_cmd("Browser.grantPermissions", {"origin": BASE_URL, "permissions": ["geolocation"]})
+        self.login(self.pages["login"])
+        for lat, lng, name, distance in zip(lats.tolist(), lngs.tolist(), names, distances.tolist()):
+            self.driver.execute_cdp_cmd("Emulation.setGeolocationOverride", {
+                "latitude": lat,
+                "longitude": lng,
+                "accuracy": 100
+            })
+            self.driver.get(self.pages["nearest_sea"])
+            shown_distance = self.wait.for_visible("//h6[contains(text(), 'Distance:')]").text
+            shown_name = self.driver.find_element(By.XPATH, "//*[contains(text(), 'Nearest Sea:')]").text
+            self.assertEqual(shown_distance, f"Distance: {nearest_sea.to_fixed(distance)} km", f"at {lat}, {lng}")
+            self.assertEqual(shown_name, f"Nearest Sea: {name}", f"at {lat}, {lng}")
+            # The page answers through its sea index, which must agree with the linear scan
+            self.assertEqual(sea_index.KNOWN_SEA_INDEX.nearest(lat, lng)["name"], name, f"at {lat}, {lng}")
+
+    def test_cache_keeps_recency_across_reloads(self):
+        """A cache hit must be saved, so the entry it refreshed outlives older ones after a reload."""
+        logging.info("Test: Distance Cache Keeps Recency Across Reloads")
+        self.require_test_hook("__distanceCache")
+        order = self.driver.execute_script(
+            """
+            const { createDistanceCache } = window.__distanceCache;
+            const options = { maxSize: 2, storageKey: "recencyCheck" };
+            const cache = createDistanceCache(options);
+            cache.get("sun", { lat: 1, lng: 1 }, () => 1);
+            cache.get("sun", { lat: 2, lng: 2 }, () => 2);
+            cache.get("sun", { lat: 1, lng: 1 }, () => 1); // hit, now the most recent
+            // A new page load restores the cache from localStorage, then a third entry evicts one
+            const restored = createDistanceCache(options);
+            restored.get("sun", { lat: 3, lng: 3 }, () => 3);
+            const order = JSON.parse(localStorage.getItem("recencyCheck")).map(([key]) => key);
+            restored.clear();
+            return order;
+            """
+        )
+        self.assertEqual(order, ["sun:1.000000,1.000000", "sun:3.000000,3.000000"])
+
+    def test_repeat_visit_served_from_cache(self):
+        """Revisit /nearest-sea at the same location and check the distance comes from the cache."""
+        logging.info("Test: Repeat Visit Served From Distance Cache")
+        self.driver.execute_cdp_cmd("Browser.grantPermissions", {"origin": BASE_URL, "permissions": ["geolocation"]})
+        self.driver.execute_cdp_cmd("Emulation.setGeolocationOverride", {
+            "latitude": 40.7128,
+            "longitude": -74.0060,
+            "accuracy": 100
+        })
+        self.login(self.pages["nearest_sea"])
+        first_distance = self.wait.for_visible("//h6[contains(text(), 'Distance:')]").text
+
+        # A reload starts with fresh counters but the cached entries are restored from localStorage
+        self.driver.get(self.pages["nearest_sea"])
+        second_distance = self.wait.for_visible("//h6[contains(text(), 'Distance:')]").text
+        self.require_test_hook("__distanceCache")
+        stats = self.driver.execute_script("return window.__distanceCache.stats();")
+        logging.info(f"Distance cache after repeat visit: {stats}")
+        self.assertEqual(first_distance, second_distance)
+        self.assertGreaterEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 0, "Repeat visit recomputed the distance")
+
+    def test_solar_distance_matches_python_twin(self):
+        """Compare the page's date-aware solar distance with solar_distance.py on sampled (lat, lng, time) triples."""
+        logging.info("Test: Solar Distance Matches Python Twin")
+        samples = int(os.environ.get("SOLAR_SAMPLES", "1000"))
+        lats, lngs, timestamps = solar_distance.random_triples(samples, seed=int(os.environ.get("SOLAR_SEED", "0")))
+        expected = solar_distance.precise(lats, lngs, timestamps)
+        self.login(self.pages["distance_to_sun"])
+        self.require_test_hook("__solarDistance")
+        # One round trip for every sample, NaN comes back as None
+        shown = self.driver.execute_script(
+            "const [lats, lngs, times] = arguments;"
+            "return lats.map((lat, i) => window.__solarDistance.preciseSolarDistance({ lat, lng: lngs[i] }, times[i]));",
+            lats.tolist(), lngs.tolist(), timestamps.tolist(),
+        )
+        mismatches = [
+            f"{lat}, {lng} at {timestamp:.0f}: page {value}, python {reference}"
+            for lat, lng, timestamp, value, reference in zip(lats, lngs, timestamps, shown, expected.tolist())
+            if value is None or nearest_sea.to_fixed(value) != nearest_sea.to_fixed(reference)
+        ]
+        self.assertFalse(mismatches, "\n".join(mismatches[:20]))
+
+    def test_pure_functions_match_python(self):
+        """Run generated inputs through the app's pure functions in one call and compare with parity.py."""
+        logging.info("Test: Pure Functions Match Python References")
+        self.require_test_hook("__pure")
+        count = int(os.environ.get("PARITY_CASES", str(parity.DEFAULT_CASES)))
+        cases = parity.random_cases(count, seed=int(os.environ.get("PARITY_SEED", "0")))
+        results, round_trip = parity.run_parity(self.driver, cases)
+        parity.log_parity(results, round_trip)
+        mismatches = [
+            f"{name}({', '.join(map(repr, args))}): page {value!r}, python {reference!r}"
+            for name, result in results.items()
+            for args, value, reference in result["mismatches"]
+        ]
+        self.assertFalse(mismatches, "\n".join(mismatches[:20]))
+
+    @unittest.skipUnless(AUTH_URL, "Set AUTH_URL to the auth_server.py the app was built against (REACT_APP_AUTH_URL)")
+    def test_login_latency_by_user_count(self):
+        """Time form logins while the auth service grows to 1k, 100k and 1M accounts; login must stay flat."""
+        logging.info("Test: Login Latency by User Count")
+        sizes = [int(size) for size in os.environ.get("AUTH_BENCHMARK_SIZES", "1000,100000,1000000").split(",")]
+        logins = int(os.environ.get("AUTH_BENCHMARK_LOGINS", "5"))
+        medians = []
+        # The service may already hold accounts, from --users or an earlier run
+        total = seed_users()
+        for size in sizes:
+            total = seed_users(generate=max(0, size - total))
+            # Generated accounts are numbered from 0; the rest are the default users
+            generated = total - len(auth_server.DEFAULT_USERS)
+            timings = []
+            for i in range(logins):
+                email, password = auth_server.generated_user(generated * (i + 1) // (logins + 1))
+                self.driver.execute_script("localStorage.clear();")
+                self.driver.get(self.pages["login"])
+                start = time.perf_counter()
+                self.login_with_form(email, password)
+                timings.append(time.perf_counter() - start)
+            medians.append(benchmark.percentile(timings, 50))
+            logging.info(
+                f"{total:>8} users: login p50 {medians[-1] * 1000:.0f}ms, "
+                f"p95 {benchmark.percentile(timings, 95) * 1000:.0f}ms"
             )
-            print(error)
-            # self.assertIn("Welcome", element.text)
-            self.assertTrue(False, "Login before accessing the application Page")
-        except TimeoutException:
-            print("aa")
-            logging.info("Properly redirected or blocked, no direct access without login.")
-            self.assertTrue(True)
-
-    # def test_valid_credentials_google_login(self):
-    #     """Successfully login using a Google account linked to the system."""
-    #     logging.info("Test: Google Login")
-
-
-    #     # Click on the Google login button. Adjust the selector as needed.
-    #     self.driver.find_element(By.ID, "google_login_button").click()
-
-
-    #     # Assuming a new window or tab is opened for Google login, switch to it
-    #     self.driver.switch_to.window(self.driver.window_handles[1])
-
-
-    #     # Wait for email field and enter the email
-    #     WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "identifierId")))
-    #     self.driver.find_element(By.ID, "identifierId").send_keys(GOOGLE_EMAIL)
-    #     self.driver.find_element(By.ID, "identifierNext").click()
-
-
-    #     # Wait for password field and enter the password
-    #     WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.NAME, "password")))
-    #     self.driver.find_element(By.NAME, "password").send_keys(GOOGLE_PASSWORD)
-    #     self.driver.find_element(By.ID, "passwordNext").click()
-
-
-    #     # Switch back to the original window/tab
-    #     self.driver.switch_to.window(self.driver.window_handles[0])
-
-
-    #     # Wait for redirection and verification of successful login
-    #     WebDriverWait(self.driver, 10).until(
-    #         EC.presence_of_element_located((By.XPATH, "//button[text()='Logout']"))
-    #     )
-    #     logout_button = self.driver.find_element(By.XPATH, "//button[text()='Logout']")
-    #     self.assertTrue(logout_button.is_displayed(), "Google Login failed")
+        self.assertLess(medians[-1], medians[0] * 2 + 0.1, "Login got slower as the user table grew")
+
+    @unittest.skipUnless(AUTH_URL, "Set AUTH_URL to the auth_server.py the app was built against (REACT_APP_AUTH_URL)")
+    def test_forged_session_rejected(self):
+        """A session written into localStorage without the auth service's signature must not open protected pages."""
+        logging.info("Test: Forged Session Rejected")
+        self.driver.get(self.pages["login"])
+        self.driver.execute_script(
+            "localStorage.setItem('session', JSON.stringify({token: 'forged', email: arguments[0], expiresAt: Date.now() + 3600000}));"
+            "localStorage.setItem('isLoggedIn', 'true'); localStorage.setItem('userEmail', arguments[0]);",
+            TEST_EMAIL,
+        )
+        with self.wait.capture_alerts():
+            self.driver.get(self.pages["distance_to_sun"])
+            self.wait.for_alert("Login before accessing the application Page")
+            self.wait.for_route("/")
+        logging.info("Forged session was rejected by the auth service.")
+
+    def test_typing_coordinates_render_budget(self):
+        """Type into the lat/lng fields and check only the page re-renders, without storage reads, within budget."""
+        logging.info("Test: Typing Coordinates Render Budget")
+        self.driver.execute_cdp_cmd("Browser.grantPermissions", {"origin": BASE_URL, "permissions": ["geolocation"]})
+        self.driver.execute_cdp_cmd("Emulation.setGeolocationOverride", {
+            "latitude": 1,
+            "longitude": 2,
+            "accuracy": 100
+        })
+        self.login(self.pages["distance_to_sun"])
+        self.require_test_hook("__renderStats")
+        # Let the position fill the fields first so its update is not counted as typing
+        self.wait.until("const input = document.querySelector(\"input[name='lat']\"); return input && input.value;",
+                        "position in the latitude field")
+        before = self.driver.execute_script("return window.__renderStats.get();")
+        self.assertIn("NavBar", before, "The app bar is not profiled")
+        # Count the email lookups the page used to make on every render
+        self.driver.execute_script("""
+            window.__emailReads = 0;
+            const getItem = Storage.prototype.getItem;
+            Storage.prototype.getItem = function (key) {
+              if (key === "userEmail") window.__emailReads += 1;
+              return getItem.call(this, key);
+            };
+        """)
+
+        keystrokes = 0
+        for name, value in (("lat", "41.0082"), ("lng", "28.9784")):
+            field = self.driver.find_element(By.NAME, name)
+            field.send_keys(Keys.CONTROL, "a")
+            field.send_keys(Keys.DELETE)
+            field.send_keys(value)
+            keystrokes += 1 + len(value)
+        self.wait.for_visible("//p[contains(., 'Your GPS Coordinates: 41.01, 28.98')]")
+
+        after = self.driver.execute_script("return window.__renderStats.get();")
+        logging.info(f"Render stats after {keystrokes} keystrokes: {after}")
+        self.assertEqual(after["NavBar"]["commits"], before["NavBar"]["commits"], "The app bar re-rendered while typing")
+        self.assertEqual(self.driver.execute_script("return window.__emailReads;"), 0,
+                         "The page read userEmail from localStorage while typing")
+        commits = after["DistanceToSunPage"]["commits"] - before["DistanceToSunPage"]["commits"]
+        duration = after["DistanceToSunPage"]["totalDuration"] - before["DistanceToSunPage"]["totalDuration"]
+        self.assertGreater(commits, 0, "Typing did not render the page")
+        self.assertLessEqual(duration / commits, RENDER_BUDGET_MS)
+
+    def test_nearest_sea_render_count(self):
+        """Open /nearest-sea and check it shows its result in two commits without re-rendering the app bar."""
+        logging.info("Test: Nearest Sea Render Count")
+        self.driver.execute_cdp_cmd("Browser.grantPermissions", {"origin": BASE_URL, "permissions": ["geolocation"]})
+        self.driver.execute_cdp_cmd("Emulation.setGeolocationOverride", {
+            "latitude": 40.7128,
+            "longitude": -74.0060,
+            "accuracy": 100
+        })
+        self.login(self.pages["nearest_sea"])
+        self.wait.for_visible("//h6[contains(text(), 'Distance:')]")
+        self.require_test_hook("__renderStats")
+
+        stats = self.driver.execute_script("return window.__renderStats.get();")
+        logging.info(f"Render stats for /nearest-sea: {stats}")
+        # Mounting, then the position and its nearest sea together
+        self.assertLessEqual(stats["NearestSeaPage"]["commits"], 2)
+        self.assertEqual(stats["NavBar"]["commits"], 1, "The app bar re-rendered after mounting")
+
+    def test_geolocation_matrix(self):
+        """Run valid, boundary, out-of-range and denied-permission positions through /nearest-sea in this browser."""
+        logging.info("Test: Geolocation Matrix")
+        cases = geo_matrix.generate_cases(int(os.environ.get("GEO_MATRIX_CASES", "40")))
+        self.login(self.pages["nearest_sea"])
+        records = geo_matrix.run_cases(self.driver, self.wait, BASE_URL, cases)
+        failures = [f"{r['kind']} {r['lat']}, {r['lng']}: {r['problem']}" for r in records if not r["ok"]]
+        self.assertFalse(failures, "\n".join(failures))
+
+    @unittest.skipUnless(OIDC_STUB_URL, "Set OIDC_STUB_URL to the oidc_stub.py the app was built against (REACT_APP_OIDC_STUB_URL)")
+    def test_valid_credentials_google_login(self):
+        """Successfully login using a Google account linked to the system."""
+        logging.info("Test: Google Login")
+        # Already signed in to "Google" as the linked account, as the popup would find it
+        sign_in_to_oidc_stub(self.driver, BASE_URL, GOOGLE_EMAIL)
+        # Reaching for the placeholder loads the Google button
+        self.wait.for_visible("//button[@id='google_login_placeholder']").click()
+        button = self.wait.for_visible("//button[@id='google_login_button']")
+        # Time the stub sign-in itself, not the chunk download before it
+        start = time.perf_counter()
+        button.click()
+        self.wait.for_route("/distance-to-sun")
+        logout_button = self.wait.for_visible("//button[contains(., 'Logout')]")
+        elapsed = time.perf_counter() - start
+        self.assertTrue(logout_button.is_displayed(), "Google Login failed")
+        self.assertLess(elapsed, 1.0, f"Google login took {elapsed:.2f}s")
+
+    @unittest.skipUnless(OIDC_STUB_URL, "Set OIDC_STUB_URL to the oidc_stub.py the app was built against (REACT_APP_OIDC_STUB_URL)")
+    def test_unverified_google_account_rejected(self):
+        """A Google ID token whose email is not verified must not log in."""
+        logging.info("Test: Unverified Google Account Rejected")
+        sign_in_to_oidc_stub(self.driver, BASE_URL, GOOGLE_EMAIL, email_verified=False)
+        self.wait.for_visible("//button[@id='google_login_placeholder']").click()
+        self.wait.for_visible("//button[@id='google_login_button']").click()
+        error = self.wait.for_visible("//div[contains(@class, 'MuiAlert-message')]")
+        self.assertIn("User account does not exist for this Gmail", error.text)
+        self.assertEqual(self.driver.execute_script("return location.pathname;"), "/")
 
     # def login_then_logout(self):
     #     """Helper function to log in and then log out."""
-    #     self.driver.find_element(By.ID, "email").send_keys("valid@example.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("validpassword")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(
-    #         EC.url_to_be("http://localhost:3000/distance-to-sun")
-    #     )
+    #     self.login(self.pages["distance_to_sun"])
     #     # Log out
     #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Logout')]").click()
     #     WebDriverWait(self.driver, 10).until(
@@ -235,39 +468,32 @@ class LoginTestCases(unittest.TestCase):
     #     logging.info("Test: Access Nearest Sea After Logout")
     #     self.login_then_logout()
     #     self.driver.get("http://localhost:3000/nearest-sea")
-    #     try:
-    #         WebDriverWait(self.driver, 10).until(
-    #             EC.presence_of_element_located((By.TAG_NAME, "h5"))
-    #         )
-    #         self.fail("Was not supposed to have direct access after logout.")
-    #     except TimeoutException:
-    #         logging.info("Successfully blocked access to Nearest Sea page after logout.")
+    #     self.wait.for_route("/")
+    #     self.assertFalse(self.driver.find_elements(By.XPATH, "//h5[contains(text(), 'Welcome')]"),
+    #                      "Was not supposed to have direct access after logout.")
+    #     logging.info("Successfully blocked access to Nearest Sea page after logout.")
 
     # def test_access_after_logout_distance_to_sun(self):
     #     """Test if /distance-to-sun can be accessed after logging in and then logging out."""
     #     logging.info("Test: Access Distance to Sun After Logout")
     #     self.login_then_logout()
     #     self.driver.get("http://localhost:3000/distance-to-sun")
-    #     try:
-    #         WebDriverWait(self.driver, 10).until(
-    #             EC.presence_of_element_located((By.TAG_NAME, "h5"))
-    #         )
-    #         self.fail("Was not supposed to have direct access after logout.")
-    #     except TimeoutException:
-    #         logging.info("Successfully blocked access to Distance to Sun page after logout.")
-
-    # def test_performance_of_pages(self):
-    #     """Test load times of pages to ensure they load within 5 seconds."""
-    #     for name, url in self.pages.items():
-    #         total_load_time = 0
-    #         for _ in range(10):
-    #             start_time = time.time()
-    #             self.driver.get(url)
-    #             WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    #             total_load_time += time.time() - start_time
-    #         average_load_time = total_load_time / 10
-    #         print(f"Average load time for {name}: {average_load_time} seconds")
-    #         self.assertTrue(average_load_time < 5, f"{name} page load time exceeded 5 seconds.")
+    #     self.wait.for_route("/")
+    #     self.assertFalse(self.driver.find_elements(By.XPATH, "//h5[contains(text(), 'Welcome')]"),
+    #                      "Was not supposed to have direct access after logout.")
+    #     logging.info("Successfully blocked access to Distance to Sun page after logout.")
+
+    @unittest.skipUnless(os.environ.get("SELENIUM_BENCHMARK"), "set SELENIUM_BENCHMARK=1 to run the page-load benchmark")
+    def test_performance_of_pages(self):
+        """Benchmark page loads with a cold and warm cache and fail on regressions against the baseline."""
+        logging.info("Test: Page Load Performance")
+        runs = int(os.environ.get("SELENIUM_BENCHMARK_RUNS", "10"))
+        threshold = float(os.environ.get("SELENIUM_BENCHMARK_THRESHOLD", "0.2"))
+        results = benchmark.run_benchmark(self.driver, BASE_URL, TEST_EMAIL, TEST_PASSWORD, runs=runs)
+        update = bool(os.environ.get("SELENIUM_BENCHMARK_UPDATE"))
+        regressions = benchmark.check_against_baseline(results, threshold=threshold, update=update)
+        regressions += benchmark.check_budgets(results)
+        self.assertFalse(regressions, "\n".join(regressions))
 
     # def test_element_display_across_devices(self):
     #     """Check if all elements are displayed correctly on different device screens."""
@@ -289,10 +515,7 @@ class LoginTestCases(unittest.TestCase):
     # def test_location_disabled_distance_to_sun(self):
     #     """Test that the app still loads with empty coordinate fields when location is disabled."""
     #     # Simulate location disabled by rejecting the alert
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login(self.pages["distance_to_sun"])
     #     WebDriverWait(self.driver, 10).until(
     #         EC.alert_is_present()
     #     )
@@ -307,10 +530,7 @@ class LoginTestCases(unittest.TestCase):
         
     # def test_location_enabled_distance_to_sun(self):
     #     """Test distance calculation on manual entry of valid coordinates."""
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login(self.pages["distance_to_sun"])
     #     # Manually enter valid coordinates
     #     self.driver.find_element(By.NAME, "lat").send_keys("45")
     #     self.driver.find_element(By.NAME, "lng").send_keys("90")
@@ -322,10 +542,7 @@ class LoginTestCases(unittest.TestCase):
 
     # def test_manual_entry_valid_coordinates_distance_to_sun(self):
     #     """Test distance calculation on manual entry of valid coordinates."""
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login(self.pages["distance_to_sun"])
     #     # Manually enter valid coordinates
     #     self.driver.find_element(By.NAME, "lat").send_keys("45")
     #     self.driver.find_element(By.NAME, "lng").send_keys("90")
@@ -337,10 +554,7 @@ class LoginTestCases(unittest.TestCase):
 
     # def test_invalid_longitude_values(self):
     #     """Test error message for longitude values outside the valid range (-180 to 180)."""
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login(self.pages["distance_to_sun"])
 
     #     # Assume login is already handled and you are at the required page
     #     WebDriverWait(self.driver, 10).until(
@@ -357,10 +571,7 @@ class LoginTestCases(unittest.TestCase):
 
     # def test_invalid_latitude_values(self):
     #     """Test error message for latitude values outside the valid range (-90 to 90)."""
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login(self.pages["distance_to_sun"])
 
     #     # Assume login is already handled and you are at the required page
     #     WebDriverWait(self.driver, 10).until(
@@ -378,10 +589,7 @@ class LoginTestCases(unittest.TestCase):
 
     # def test_string_values_in_coordinates(self):
     #     """Test error message when entering string values in coordinate fields."""
-    #     self.driver.find_element(By.ID, "email").send_keys("name@mail.com")
-    #     self.driver.find_element(By.ID, "password").send_keys("password")
-    #     self.driver.find_element(By.XPATH, "//button[contains(text(), 'Login')]").click()
-    #     WebDriverWait(self.driver, 10).until(EC.url_to_be("http://localhost:3000/distance-to-sun"))
+    #     self.login(self.pages["distance_to_sun"])
 
     #     # Assume login is already handled and you are at the required page
     #     WebDriverWait(self.driver, 10).until(
@@ -420,10 +628,13 @@ class LoginTestCases(unittest.TestCase):
     #                     self.fail(f"{element_id} at {name} on {device} screen is not responsive")
         
     def tearDown(self):
-        self.driver.quit()
+        self.wait.report(self._testMethodName)
+        if tracer:
+            tracer.collect_browser_entries(self.driver)
+        self.trace.close()
+        # The shared browser is reset by the pool when the next test acquires it
+        if self.own_browser:
+            self.driver.quit()
 
 if __name__ == "__main__":
     unittest.main()
-
-
-
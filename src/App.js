@@ -1,31 +1,36 @@
-import React from "react";
+import React, { Suspense, lazy } from "react";
 import { Routes, Route } from "react-router-dom";
 import LoginForm from "./LoginForm";
-import NearestSeaPage from "./NearestSeaPage"; // New Page
-import DistanceToSunPage from "./DistanceToSunPage"; // New Page
 import ProtectedRoute from "./ProtectedRoute";
+import { loadDistanceToSunPage, loadNearestSeaPage } from "./routes";
+
+// Pages are split into their own chunks so the login screen loads only what it needs
+const NearestSeaPage = lazy(loadNearestSeaPage);
+const DistanceToSunPage = lazy(loadDistanceToSunPage);
 
 function App() {
   return (
-    <Routes>
-      <Route path="/" element={<LoginForm />} />
-      <Route
-        path="/nearest-sea"
-        element={
-          <ProtectedRoute>
-            <NearestSeaPage />
-          </ProtectedRoute>
-        }
-      />
-      <Route
-        path="/distance-to-sun"
-        element={
-          <ProtectedRoute>
-            <DistanceToSunPage />
-          </ProtectedRoute>
-        }
-      />
-    </Routes>
+    <Suspense fallback={null}>
+      <Routes>
+        <Route path="/" element={<LoginForm />} />
+        <Route
+          path="/nearest-sea"
+          element={
+            <ProtectedRoute>
+              <NearestSeaPage />
+            </ProtectedRoute>
+          }
+        />
+        <Route
+          path="/distance-to-sun"
+          element={
+            <ProtectedRoute>
+              <DistanceToSunPage />
+            </ProtectedRoute>
+          }
+        />
+      </Routes>
+    </Suspense>
   );
 }
 
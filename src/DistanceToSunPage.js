@@ -1,60 +1,64 @@
-import React, { useEffect, useState } from "react";
+import React, { useCallback, useEffect, useMemo, useState } from "react";
 import {
   Typography,
   Box,
   Card,
   CardContent,
   Button,
-  AppBar,
-  Toolbar,
   Container,
   TextField,
-  useMediaQuery,
-  useTheme,
+  FormControlLabel,
+  Switch,
 } from "@mui/material";
-import PublicIcon from "@mui/icons-material/Public"; // Icon for going to sea page
-import LogoutIcon from "@mui/icons-material/Logout"; // Logout icon
 import { useNavigate } from "react-router-dom";
+import { clearSession } from "./authProvider";
+import { distanceCache } from "./distanceCache";
+import NavBar from "./NavBar";
+import { Profiled } from "./renderProfiler";
+import { loadNearestSeaPage, prefetchRoute } from "./routes";
+import {
+  preciseSolarDistance,
+  solarDistanceCalculator,
+} from "./solarDistance";
+import { validateCoordinates } from "./validators";
 
-function solarDistanceCalculator(coords) {
-  const averageDistanceToSun = 149600000; // Average distance from Earth to the Sun in kilometers
-  if (!coords || coords.lat == null || coords.lng == null) {
-    return NaN; // Return NaN if coordinates are invalid
-  }
-
-  // Coordinates must be numeric and within valid ranges
-  if (
-    isNaN(coords.lat) ||
-    isNaN(coords.lng) ||
-    coords.lat < -90 ||
-    coords.lat > 90 ||
-    coords.lng < -180 ||
-    coords.lng > 180
-  ) {
-    return NaN;
-  }
-
-  // Calculate the distance (simplified for the example, without date considerations)
-  const latitudeAdjustment = (coords.lat / 90.0) * 100000; // Simulated adjustment
-  return averageDistanceToSun - latitudeAdjustment;
+// Current local time in the format of a datetime-local input, e.g. "2024-01-03T12:30"
+function currentLocalTime() {
+  const now = new Date();
+  now.setMinutes(now.getMinutes() - now.getTimezoneOffset());
+  return now.toISOString().slice(0, 16);
 }
 
+// Returns the current error unchanged when it is already empty, so clearing it
+// on every keystroke does not count as a state change
+const clearError = (previous) => (previous ? "" : previous);
+
 function DistanceToSunPage() {
   const [location, setLocation] = useState({ lat: "", lng: "" });
   const [distance, setDistance] = useState(null);
   const [error, setError] = useState("");
+  const [precise, setPrecise] = useState(false);
+  const [time, setTime] = useState(currentLocalTime);
+  // Read once, the email does not change while the page is open
+  const [userEmail] = useState(() => localStorage.getItem("userEmail"));
   const navigate = useNavigate();
-  const theme = useTheme();
-  const isMobile = useMediaQuery(theme.breakpoints.down("sm"));
+
+  // The nearest sea page is one click away in the app bar
+  useEffect(() => prefetchRoute(loadNearestSeaPage), []);
 
   useEffect(() => {
+    // Ignore answers that arrive after unmounting, e.g. for the first of the
+    // two mounts StrictMode does in development
+    let cancelled = false;
     if ("geolocation" in navigator) {
       navigator.geolocation.getCurrentPosition(
         (position) => {
+          if (cancelled) return;
           const { latitude, longitude } = position.coords;
           setLocation({ lat: latitude.toString(), lng: longitude.toString() });
         },
         (error) => {
+          if (cancelled) return;
           console.error("Geolocation error:", error);
           setLocation({ lat: "", lng: "" }); // Clear fields if there is an error
         }
@@ -63,77 +67,83 @@ function DistanceToSunPage() {
       console.error("Geolocation not supported");
       setLocation({ lat: "", lng: "" }); // Clear fields if geolocation is not supported
     }
+    return () => {
+      cancelled = true;
+    };
   }, []);
 
-  const handleLocationChange = (event) => {
+  const handleLocationChange = useCallback((event) => {
     const { name, value } = event.target;
     setLocation((prev) => ({ ...prev, [name]: value }));
-    setError(""); // Clear any previous error when the user starts typing
-  };
+    setError(clearError); // Clear any previous error when the user starts typing
+  }, []);
 
-  const validateCoordinates = (lat, lng) => {
-    if (isNaN(lat) || isNaN(lng)) {
-      return "Coordinates must be numeric.";
-    }
-    if (lat < -90 || lat > 90) {
-      return "Latitude must be between -90 and 90 degrees.";
-    }
-    if (lng < -180 || lng > 180) {
-      return "Longitude must be between -180 and 180 degrees.";
-    }
-    return "";
-  };
+  const handlePreciseChange = useCallback((event) => {
+    setPrecise(event.target.checked);
+    setError(clearError);
+  }, []);
 
-  const calculateDistance = () => {
+  const handleTimeChange = useCallback((event) => {
+    setTime(event.target.value);
+    setError(clearError);
+  }, []);
+
+  const calculateDistance = useCallback(() => {
     const lat = parseFloat(location.lat);
     const lng = parseFloat(location.lng);
     const validationResult = validateCoordinates(lat, lng);
-    if (validationResult === "") {
-      const calculatedDistance = solarDistanceCalculator({ lat, lng });
+    if (validationResult === "" && precise) {
+      // The input has minute resolution, so the timestamp is a whole minute
+      const timestamp = new Date(time).getTime();
+      if (isNaN(timestamp)) {
+        setError("Please enter a valid date and time.");
+        setDistance(null);
+        return;
+      }
+      const calculatedDistance = distanceCache.get(
+        `sun@${timestamp}`,
+        { lat, lng },
+        () => preciseSolarDistance({ lat, lng }, timestamp)
+      );
+      setDistance(calculatedDistance);
+    } else if (validationResult === "") {
+      const calculatedDistance = distanceCache.get("sun", { lat, lng }, () =>
+        solarDistanceCalculator({ lat, lng })
+      );
       setDistance(calculatedDistance);
     } else {
       setError(validationResult);
       setDistance(null);
     }
-  };
+  }, [location, precise, time]);
 
-  const goToSea = () => {
+  const goToSea = useCallback(() => {
     navigate("/nearest-sea");
-  };
+  }, [navigate]);
 
-  const logout = () => {
-    localStorage.removeItem("isLoggedIn");
-    localStorage.removeItem("userEmail");
+  const logout = useCallback(() => {
+    clearSession();
     navigate("/");
-  };
+  }, [navigate]);
+
+  const coordinatesText = useMemo(
+    () =>
+      location.lat && location.lng
+        ? `${parseFloat(location.lat).toFixed(2)}, ${parseFloat(
+            location.lng
+          ).toFixed(2)}`
+        : "Not set",
+    [location]
+  );
+  const distanceText = useMemo(
+    () =>
+      distance ? `${distance.toFixed(2)} km` : "Please enter coordinates",
+    [distance]
+  );
+
   return (
-    <React.Fragment>
-      <AppBar position="static" sx={{ width: "100%" }}>
-        <Toolbar
-          sx={{
-            justifyContent: "center",
-            "& > *": { maxWidth: 250, flexGrow: 1 },
-          }}
-        >
-          <Button
-            startIcon={<PublicIcon />}
-            variant="outlined"
-            color="inherit"
-            onClick={goToSea}
-          >
-            Nearest Sea
-          </Button>
-          <Button
-            startIcon={<LogoutIcon />}
-            color="inherit"
-            variant="outlined"
-            onClick={logout}
-            sx={{ ml: 0.5 }}
-          >
-            Logout
-          </Button>
-        </Toolbar>
-      </AppBar>
+    <Profiled id="DistanceToSunPage">
+      <NavBar label="Nearest Sea" onNavigate={goToSea} onLogout={logout} />
       <Container maxWidth="sm">
         <Box
           sx={{
@@ -143,11 +153,11 @@ function DistanceToSunPage() {
             alignItems: "center",
             gap: 2,
             width: "100%",
-            p: isMobile ? 1 : 3,
+            p: { xs: 1, sm: 3 },
           }}
         >
           <Typography variant="h5" gutterBottom>
-            Welcome {localStorage.getItem("userEmail")}
+            Welcome {userEmail}
           </Typography>
           <Card raised sx={{ width: "100%", textAlign: "center" }}>
             <CardContent>
@@ -157,8 +167,8 @@ function DistanceToSunPage() {
                 sx={{
                   backgroundColor: "blue",
                   color: "white",
-                  padding: theme.spacing(1),
-                  borderRadius: theme.shape.borderRadius,
+                  p: 1,
+                  borderRadius: 1,
                   mb: 2,
                 }}
               >
@@ -182,6 +192,30 @@ function DistanceToSunPage() {
                 sx={{ mb: 2 }}
                 fullWidth
               />
+              <FormControlLabel
+                control={
+                  <Switch
+                    id="precise_mode"
+                    checked={precise}
+                    onChange={handlePreciseChange}
+                  />
+                }
+                label="Date-aware (high precision)"
+                sx={{ mb: 2, display: "flex" }}
+              />
+              {precise && (
+                <TextField
+                  label="Date and time"
+                  type="datetime-local"
+                  variant="outlined"
+                  name="time"
+                  value={time}
+                  onChange={handleTimeChange}
+                  InputLabelProps={{ shrink: true }}
+                  sx={{ mb: 2 }}
+                  fullWidth
+                />
+              )}
               <Button
                 variant="contained"
                 id="sun_button"
@@ -196,24 +230,14 @@ function DistanceToSunPage() {
                 </Typography>
               )}
               <Typography sx={{ mt: 2, fontSize: 14, color: "text.secondary" }}>
-                Your GPS Coordinates:{" "}
-                {location.lat && location.lng
-                  ? `${parseFloat(location.lat).toFixed(2)}, ${parseFloat(
-                      location.lng
-                    ).toFixed(2)}`
-                  : "Not set"}
-              </Typography>
-              <Typography variant="body1">
-                Distance:{" "}
-                {distance
-                  ? `${distance.toFixed(2)} km`
-                  : "Please enter coordinates"}
+                Your GPS Coordinates: {coordinatesText}
               </Typography>
+              <Typography variant="body1">Distance: {distanceText}</Typography>
             </CardContent>
           </Card>
         </Box>
       </Container>
-    </React.Fragment>
+    </Profiled>
   );
 }
 
@@ -0,0 +1,50 @@
+import React, { useCallback } from "react";
+import { Button } from "@mui/material";
+import { GoogleOAuthProvider, GoogleLogin } from "@react-oauth/google";
+
+const GOOGLE_CLIENT_ID =
+  "213591742347-23gmgjsok7p1siuukva9sm7gvofs757o.apps.googleusercontent.com";
+// oidc_stub.py, which issues ID tokens for the account the browser is signed in with
+const OIDC_STUB_URL = process.env.REACT_APP_OIDC_STUB_URL;
+
+// Stands in for Google's button when REACT_APP_OIDC_STUB_URL is set. It asks
+// the stub for an ID token and answers with the same credential response
+function StubLoginButton({ onSuccess, onError }) {
+  const signIn = useCallback(async () => {
+    try {
+      const response = await fetch(
+        `${OIDC_STUB_URL}/token?client_id=${GOOGLE_CLIENT_ID}`,
+        { credentials: "include" }
+      );
+      if (!response.ok) {
+        onError();
+        return;
+      }
+      onSuccess(await response.json());
+    } catch (error) {
+      console.error("OIDC stub error:", error);
+      onError();
+    }
+  }, [onSuccess, onError]);
+
+  return (
+    <Button id="google_login_button" variant="outlined" onClick={signIn}>
+      Sign in with Google
+    </Button>
+  );
+}
+
+// Loaded lazily by LoginForm: the provider injects Google's sign-in script,
+// so nothing from Google is downloaded until the button is about to be shown
+function GoogleLoginButton({ onSuccess, onError }) {
+  if (OIDC_STUB_URL) {
+    return <StubLoginButton onSuccess={onSuccess} onError={onError} />;
+  }
+  return (
+    <GoogleOAuthProvider clientId={GOOGLE_CLIENT_ID}>
+      <GoogleLogin onSuccess={onSuccess} onError={onError} useOneTap />
+    </GoogleOAuthProvider>
+  );
+}
+
+export default GoogleLoginButton;
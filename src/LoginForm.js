@@ -1,7 +1,5 @@
-import React, { useState } from "react";
+import React, { Suspense, lazy, useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { jwtDecode } from "jwt-decode";
-import { GoogleLogin } from "@react-oauth/google";
 import {
   Container,
   Typography,
@@ -13,20 +11,27 @@ import {
   CardContent,
   CssBaseline,
 } from "@mui/material";
-import { onSignIn } from "./onSignIn";
+import { onGoogleSignIn, onSignIn } from "./onSignIn";
+import { loadDistanceToSunPage, prefetchRoute } from "./routes";
+import { validateEmail } from "./validators";
+
+// Google's sign-in script is only loaded together with this chunk
+const GoogleLoginButton = lazy(() => import("./GoogleLoginButton"));
 
 function LoginForm() {
   const [email, setEmail] = useState("");
   const [password, setPassword] = useState("");
   const [errorMessage, setErrorMessage] = useState("");
+  const [showGoogleLogin, setShowGoogleLogin] = useState(false);
   const navigate = useNavigate();
 
-  const validateEmail = (email) => {
-    const regex = /^[\w-\.]+@([\w-]+\.)+[\w-]{2,4}$/;
-    return regex.test(email);
-  };
+  // The sun page is where a successful login goes next
+  useEffect(() => prefetchRoute(loadDistanceToSunPage), []);
+
+  // Google login is only downloaded when the user reaches for its button
+  const loadGoogleLogin = () => setShowGoogleLogin(true);
 
-  const handleSubmit = (event) => {
+  const handleSubmit = async (event) => {
     event.preventDefault();
     setErrorMessage(""); // Reset error messages on new submission
 
@@ -38,21 +43,21 @@ function LoginForm() {
       setErrorMessage("Please enter a valid email address.");
       return;
     }
-    if (onSignIn(email, password)) {
-      localStorage.setItem("isLoggedIn", "true");
-      localStorage.setItem("userEmail", email);
-      navigate("/distance-to-sun"); // Navigate to success page
-    } else {
-      setErrorMessage("Invalid email address or password. Please try again.");
+    try {
+      if (await onSignIn(email, password)) {
+        navigate("/distance-to-sun"); // Navigate to success page
+      } else {
+        setErrorMessage("Invalid email address or password. Please try again.");
+      }
+    } catch (error) {
+      console.error("Login Failed: ", error);
+      setErrorMessage("Login Failed. Please try again.");
     }
   };
 
-  const handleGoogleLogin = (credentialResponse) => {
+  const handleGoogleLogin = async (credentialResponse) => {
     try {
-      const decoded = jwtDecode(credentialResponse.credential);
-      if (decoded.email_verified && onSignIn(decoded.email)) {
-        localStorage.setItem("isLoggedIn", "true");
-        localStorage.setItem("userEmail", decoded.email);
+      if (await onGoogleSignIn(credentialResponse.credential)) {
         navigate("/distance-to-sun"); // Navigate to success page
       } else {
         setErrorMessage(
@@ -126,15 +131,33 @@ function LoginForm() {
                 Login
               </Button>
             </form>
-            <GoogleLogin
-              onSuccess={(credentialResponse) =>
-                handleGoogleLogin(credentialResponse)
-              }
-              onError={() =>
-                setErrorMessage("Google login failed. Please try again.")
-              }
-              useOneTap
-            />
+            {/* Reserve the button's height so loading it does not shift the layout */}
+            <Box sx={{ minHeight: 44 }}>
+              {showGoogleLogin ? (
+                <Suspense fallback={null}>
+                  <GoogleLoginButton
+                    onSuccess={(credentialResponse) =>
+                      handleGoogleLogin(credentialResponse)
+                    }
+                    onError={() =>
+                      setErrorMessage("Google login failed. Please try again.")
+                    }
+                  />
+                </Suspense>
+              ) : (
+                // Stands in for Google's button until the pointer or focus
+                // reaches it, then swaps for the real one
+                <Button
+                  id="google_login_placeholder"
+                  variant="outlined"
+                  onPointerEnter={loadGoogleLogin}
+                  onFocus={loadGoogleLogin}
+                  onClick={loadGoogleLogin}
+                >
+                  Sign in with Google
+                </Button>
+              )}
+            </Box>
           </Box>
         </CardContent>
       </Card>
@@ -0,0 +1,42 @@
+import React, { memo } from "react";
+import { AppBar, Toolbar, Button } from "@mui/material";
+import PublicIcon from "@mui/icons-material/Public"; // Icon for the other page
+import LogoutIcon from "@mui/icons-material/Logout"; // Logout icon
+import { Profiled } from "./renderProfiler";
+
+// App bar shared by both pages. It is memoized, so with stable handlers it does
+// not re-render while the user types into the page below it.
+function NavBar({ label, onNavigate, onLogout }) {
+  return (
+    <Profiled id="NavBar">
+      <AppBar position="static" sx={{ width: "100%" }}>
+        <Toolbar
+          sx={{
+            justifyContent: "center",
+            "& > *": { maxWidth: 250, flexGrow: 1 },
+          }}
+        >
+          <Button
+            startIcon={<PublicIcon />}
+            variant="outlined"
+            color="inherit"
+            onClick={onNavigate}
+          >
+            {label}
+          </Button>
+          <Button
+            startIcon={<LogoutIcon />}
+            color="inherit"
+            variant="outlined"
+            onClick={onLogout}
+            sx={{ ml: 0.5 }}
+          >
+            Logout
+          </Button>
+        </Toolbar>
+      </AppBar>
+    </Profiled>
+  );
+}
+
+export default memo(NavBar);
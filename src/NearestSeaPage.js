@@ -1,20 +1,12 @@
-import React, { useEffect, useState } from "react";
-import {
-  Typography,
-  Box,
-  Card,
-  CardContent,
-  Button,
-  AppBar,
-  Toolbar,
-  IconButton,
-  Container,
-  useTheme,
-  useMediaQuery,
-} from "@mui/material";
+import React, { useCallback, useEffect, useMemo, useState } from "react";
+import { Typography, Box, Card, CardContent, Container } from "@mui/material";
 import { useNavigate } from "react-router-dom";
-import LogoutIcon from "@mui/icons-material/Logout"; // Logout icon
-import PublicIcon from "@mui/icons-material/Public"; // Icon for distance to sun
+import { buildSeaIndex, loadSeaIndex } from "./seaIndex";
+import { clearSession } from "./authProvider";
+import { distanceCache } from "./distanceCache";
+import NavBar from "./NavBar";
+import { Profiled } from "./renderProfiler";
+import { loadDistanceToSunPage, prefetchRoute } from "./routes";
 
 const knownSeaCoordinates = [
   { lat: 41.225, lng: 29.1597, name: "Black Sea" },
@@ -24,51 +16,60 @@ const knownSeaCoordinates = [
   { lat: 38.4339, lng: 27.1444, name: "Aegean Sea" },
 ];
 
-function calculateDistanceToNearestSea(coords) {
-  if (!coords || coords.lat == null || coords.lng == null) {
-    return { distance: NaN, name: "" }; // Return NaN if coordinates are invalid
-  }
-
-  const R = 6371; // Earth's radius in kilometers
-  const toRadians = (degree) => (degree * Math.PI) / 180;
+const defaultSeaIndex = buildSeaIndex(knownSeaCoordinates);
+let seaIndexReady = null;
 
-  const distances = knownSeaCoordinates.map((sea) => {
-    const latDistance = toRadians(sea.lat - coords.lat);
-    const lngDistance = toRadians(sea.lng - coords.lng);
-    const a =
-      Math.sin(latDistance / 2) * Math.sin(latDistance / 2) +
-      Math.cos(toRadians(coords.lat)) *
-        Math.cos(toRadians(sea.lat)) *
-        Math.sin(lngDistance / 2) *
-        Math.sin(lngDistance / 2);
-    const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
-    return { distance: R * c, name: sea.name };
-  });
+// Resolves to the coastline dataset index when REACT_APP_COASTLINE_URL is set,
+// otherwise to the index of the known seas above
+function getSeaIndex() {
+  if (!seaIndexReady) {
+    const coastlineUrl = process.env.REACT_APP_COASTLINE_URL;
+    seaIndexReady = coastlineUrl
+      ? loadSeaIndex(coastlineUrl).catch((error) => {
+          console.error("Coastline dataset error:", error);
+          return defaultSeaIndex;
+        })
+      : Promise.resolve(defaultSeaIndex);
+  }
+  return seaIndexReady;
+}
 
-  const nearestSea = distances.reduce((prev, curr) =>
-    prev.distance < curr.distance ? prev : curr
-  );
-  return nearestSea; // Returns the closest sea and its distance
+export function calculateDistanceToNearestSea(coords, seaIndex = defaultSeaIndex) {
+  return seaIndex.nearest(coords); // Returns the closest sea and its distance
 }
 
 function NearestSeaPage() {
   const [location, setLocation] = useState({ lat: null, lng: null });
   const [nearestSea, setNearestSea] = useState(null);
+  // Read once, the email does not change while the page is open
+  const [userEmail] = useState(() => localStorage.getItem("userEmail"));
   const navigate = useNavigate();
 
+  // The sun page is one click away in the app bar
+  useEffect(() => prefetchRoute(loadDistanceToSunPage), []);
+
   useEffect(() => {
+    // Ignore answers that arrive after unmounting, e.g. for the first of the
+    // two mounts StrictMode does in development
+    let cancelled = false;
     if ("geolocation" in navigator) {
       navigator.geolocation.getCurrentPosition(
         (position) => {
           const { latitude, longitude } = position.coords;
-          setLocation({ lat: latitude, lng: longitude });
-          const result = calculateDistanceToNearestSea({
-            lat: latitude,
-            lng: longitude,
+          getSeaIndex().then((seaIndex) => {
+            if (cancelled) return;
+            const coords = { lat: latitude, lng: longitude };
+            // The dataset id is part of the key so every dataset gets its own entries
+            const result = distanceCache.get(`sea-${seaIndex.id}`, coords, () =>
+              calculateDistanceToNearestSea(coords, seaIndex)
+            );
+            // Both updates land in the same commit
+            setLocation(coords);
+            setNearestSea(result);
           });
-          setNearestSea(result);
         },
         (error) => {
+          if (cancelled) return;
           console.error("Geolocation error:", error);
           setNearestSea({ distance: NaN, name: "Enable GPS and Try Again" });
         }
@@ -76,52 +77,35 @@ function NearestSeaPage() {
     } else {
       setNearestSea({ distance: NaN, name: "Geolocation not supported" });
     }
+    return () => {
+      cancelled = true;
+    };
   }, []);
 
-  const logout = () => {
-    localStorage.removeItem("isLoggedIn");
-    localStorage.removeItem("userEmail");
+  const logout = useCallback(() => {
+    clearSession();
     navigate("/");
-  };
+  }, [navigate]);
 
-  const goToSolar = () => {
+  const goToSolar = useCallback(() => {
     navigate("/distance-to-sun");
-  };
+  }, [navigate]);
 
-  const theme = useTheme();
-  const isMobile = useMediaQuery(theme.breakpoints.down("sm"));
+  const coordinatesText = useMemo(
+    () =>
+      location.lat && location.lng
+        ? `${location.lat.toFixed(2)}, ${location.lng.toFixed(2)}`
+        : "Unavailable",
+    [location]
+  );
 
   return (
-    <React.Fragment>
-      <AppBar position="static" sx={{ width: "100%" }}>
-        <Toolbar
-          sx={{
-            justifyContent: "center",
-            "& > *": {
-              maxWidth: 250,
-              flexGrow: 1,
-            },
-          }}
-        >
-          <Button
-            startIcon={<PublicIcon />}
-            variant="outlined"
-            color="inherit"
-            onClick={goToSolar}
-          >
-            Distance to Sun
-          </Button>
-          <Button
-            startIcon={<LogoutIcon />}
-            color="inherit"
-            variant="outlined"
-            onClick={logout}
-            sx={{ ml: 0.5 }}
-          >
-            Logout
-          </Button>
-        </Toolbar>
-      </AppBar>
+    <Profiled id="NearestSeaPage">
+      <NavBar
+        label="Distance to Sun"
+        onNavigate={goToSolar}
+        onLogout={logout}
+      />
       <Container maxWidth="sm">
         <Box
           sx={{
@@ -131,11 +115,11 @@ function NearestSeaPage() {
             alignItems: "center",
             gap: 2,
             width: "100%",
-            p: isMobile ? 1 : 3,
+            p: { xs: 1, sm: 3 },
           }}
         >
           <Typography variant="h5" gutterBottom>
-            Welcome {localStorage.getItem("userEmail")}
+            Welcome {userEmail}
           </Typography>
           <Card raised sx={{ width: "100%", textAlign: "center" }}>
             <CardContent>
@@ -145,17 +129,14 @@ function NearestSeaPage() {
                 sx={{
                   backgroundColor: "blue",
                   color: "white",
-                  padding: theme.spacing(1),
-                  borderRadius: theme.shape.borderRadius,
+                  p: 1,
+                  borderRadius: 1,
                 }}
               >
                 Nearest Sea Calculator
               </Typography>
               <Typography sx={{ fontSize: 14, color: "text.secondary", mb: 2 }}>
-                Your GPS Coordinates:{" "}
-                {location.lat && location.lng
-                  ? `${location.lat.toFixed(2)}, ${location.lng.toFixed(2)}`
-                  : "Unavailable"}
+                Your GPS Coordinates: {coordinatesText}
               </Typography>
               {nearestSea ? (
                 <>
@@ -183,7 +164,7 @@ function NearestSeaPage() {
           </Card>
         </Box>
       </Container>
-    </React.Fragment>
+    </Profiled>
   );
 }
 
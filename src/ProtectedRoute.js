@@ -1,11 +1,28 @@
-import React from "react";
+import React, { useEffect, useState } from "react";
 import { Navigate, useLocation } from "react-router-dom";
+import { getVerifiedSession, verifySession } from "./authProvider";
 
 const ProtectedRoute = ({ children }) => {
-  const isLoggedIn = localStorage.getItem("isLoggedIn");
+  // A session the provider already vouched for needs no new check; undefined
+  // means the cached token is still being verified
+  const [session, setSession] = useState(getVerifiedSession);
   const location = useLocation();
 
-  if (!isLoggedIn) {
+  useEffect(() => {
+    if (session !== undefined) return;
+    let cancelled = false;
+    verifySession().then((result) => {
+      if (!cancelled) setSession(result);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [session]);
+
+  if (session === undefined) {
+    return null;
+  }
+  if (!session) {
     alert("Login before accessing the application Page");
     return <Navigate to="/" replace state={{ from: location }} />;
   }
@@ -0,0 +1,189 @@
+// Pluggable auth provider behind onSignIn. With REACT_APP_AUTH_URL set, logins
+// go to that service (auth_server.py locally); otherwise the local provider
+// checks a small in-memory user table. Both answer with a session
+// { token, email, expiresAt } that is cached in localStorage.
+//
+// Route guards call verifySession. With a service, the cached token is sent to
+// its /session endpoint once per page load, and the answer is kept in memory
+// until the session expires, so navigating between pages costs no request. A
+// token written into localStorage by hand does not get past it. The local
+// provider has nothing to ask, so it accepts any unexpired cached session.
+import { jwtDecode } from "jwt-decode";
+import { sha256 as sha256Fallback } from "./sha256";
+
+const SESSION_KEY = "session";
+const SESSION_TTL_MS =
+  (Number(process.env.REACT_APP_SESSION_TTL_MINUTES) || 60) * 60 * 1000;
+
+const toHex = (buffer) =>
+  [...new Uint8Array(buffer)]
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+
+// crypto.subtle is missing outside secure contexts, e.g. http://<lan-ip>:3000
+const sha256 = async (text) => {
+  const bytes = new TextEncoder().encode(text);
+  return toHex(
+    crypto.subtle
+      ? await crypto.subtle.digest("SHA-256", bytes)
+      : sha256Fallback(bytes)
+  );
+};
+
+// Compares every character so the time taken does not depend on where they differ
+const constantTimeEqual = (a, b) => {
+  if (a.length !== b.length) {
+    return false;
+  }
+  let difference = 0;
+  for (let i = 0; i < a.length; i++) {
+    difference |= a.charCodeAt(i) ^ b.charCodeAt(i);
+  }
+  return difference === 0;
+};
+
+const newToken = () => {
+  const bytes = new Uint8Array(16);
+  crypto.getRandomValues(bytes);
+  return toHex(bytes);
+};
+
+// Users keyed on their email, with sha256(salt + password). Google-only accounts
+// have no password and sign in through Google.
+const LOCAL_USERS = new Map([
+  [
+    "name@mail.com",
+    {
+      salt: "5f1c0e8a9b3d4f27a6e1c8d0b2f49e73",
+      hash: "ed27006897a9a4658a3493bd9e0cfd19aed521c3fde65f199d5686d3f2ce2ca6",
+    },
+  ],
+  ["validationtest542@gmail.com", { google: true }],
+]);
+// Checked for unknown emails so they take as long as a wrong password
+const UNKNOWN_USER = { salt: "", hash: "0".repeat(64) };
+
+export const localProvider = {
+  async signIn(email, password) {
+    const user = LOCAL_USERS.get(email.toLowerCase());
+    const record = user && user.hash ? user : UNKNOWN_USER;
+    const matches = constantTimeEqual(
+      await sha256(record.salt + password),
+      record.hash
+    );
+    if (!matches || record === UNKNOWN_USER) {
+      return null;
+    }
+    return { token: newToken(), email, expiresAt: Date.now() + SESSION_TTL_MS };
+  },
+
+  async signInWithGoogle(credential) {
+    const decoded = jwtDecode(credential);
+    const user = LOCAL_USERS.get(String(decoded.email).toLowerCase());
+    if (!decoded.email_verified || !user || !user.google) {
+      return null;
+    }
+    return {
+      token: newToken(),
+      email: decoded.email,
+      expiresAt: Date.now() + SESSION_TTL_MS,
+    };
+  },
+};
+
+export const createHttpProvider = (url) => {
+  // The browser keeps the connection to the service alive between requests,
+  // so after the first login no new connection is opened
+  const post = async (path, body) => {
+    const response = await fetch(`${url}${path}`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+    });
+    if (response.status === 401) {
+      return null;
+    }
+    if (!response.ok) {
+      throw new Error(`Auth service answered ${response.status}`);
+    }
+    return response.json();
+  };
+
+  return {
+    signIn: (email, password) => post("/login", { email, password }),
+    signInWithGoogle: (credential) => post("/google", { credential }),
+    // The service's { email, expiresAt } for a token it signed, or null
+    validate: (token) => post("/session", { token }),
+  };
+};
+
+export const authProvider = process.env.REACT_APP_AUTH_URL
+  ? createHttpProvider(process.env.REACT_APP_AUTH_URL)
+  : localProvider;
+
+// Sessions the provider vouched for on this page load, keyed on their token
+const verified = new Map();
+
+export const saveSession = (session) => {
+  // Just issued by the provider, so it needs no check
+  verified.set(session.token, session);
+  localStorage.setItem(SESSION_KEY, JSON.stringify(session));
+  // Pages read these to greet the user
+  localStorage.setItem("isLoggedIn", "true");
+  localStorage.setItem("userEmail", session.email);
+};
+
+// The cached session if it has a token and has not expired, otherwise null
+export const getSession = () => {
+  try {
+    const session = JSON.parse(localStorage.getItem(SESSION_KEY));
+    if (session && session.token && session.expiresAt > Date.now()) {
+      return session;
+    }
+  } catch (error) {
+    console.error("Session could not be read:", error);
+  }
+  return null;
+};
+
+// Without a network round trip: the session when it is known to be valid, null
+// when there is none, or undefined when verifySession has to ask the provider
+export const getVerifiedSession = () => {
+  const session = getSession();
+  if (!session || !authProvider.validate) {
+    return session;
+  }
+  const known = verified.get(session.token);
+  if (known && known.expiresAt > Date.now()) {
+    return known;
+  }
+  return undefined;
+};
+
+// Resolves to the cached session if the provider confirms its token, otherwise
+// to null. A service that cannot be reached counts as a rejection.
+export const verifySession = async () => {
+  const session = getVerifiedSession();
+  if (session !== undefined) {
+    return session;
+  }
+  const { token } = getSession();
+  try {
+    const confirmed = await authProvider.validate(token);
+    if (confirmed && confirmed.expiresAt > Date.now()) {
+      const result = { ...confirmed, token };
+      verified.set(token, result);
+      return result;
+    }
+  } catch (error) {
+    console.error("Session could not be verified:", error);
+  }
+  return null;
+};
+
+export const clearSession = () => {
+  verified.clear();
+  localStorage.removeItem(SESSION_KEY);
+  localStorage.removeItem("isLoggedIn");
+  localStorage.removeItem("userEmail");
+};
@@ -0,0 +1,104 @@
+// LRU cache for distance results, keyed on coordinates rounded to `precision`
+// decimal places. Entries are kept in localStorage so a reload or a repeat
+// visit is served from the cache. A Map iterates in insertion order, so the
+// first key is always the least recently used one.
+
+const STORAGE_KEY = "distanceCache";
+
+// Whole number from a build setting, or `fallback` when it is unset or out of range
+function integerSetting(value, fallback, min, max) {
+  if (value === undefined || value === "") {
+    return fallback;
+  }
+  const number = Number(value);
+  if (!Number.isInteger(number) || number < min || number > max) {
+    console.error(`Ignoring ${value}, expected a whole number ${min}-${max}`);
+    return fallback;
+  }
+  return number;
+}
+
+export function createDistanceCache({
+  maxSize = 500,
+  precision = 6,
+  storageKey = STORAGE_KEY,
+} = {}) {
+  const entries = new Map();
+  const stats = { hits: 0, misses: 0, evictions: 0 };
+
+  try {
+    JSON.parse(localStorage.getItem(storageKey) || "[]")
+      .slice(-maxSize)
+      .forEach(([key, value]) => entries.set(key, value));
+  } catch (error) {
+    console.error("Distance cache could not be restored:", error);
+  }
+
+  const save = () => {
+    try {
+      localStorage.setItem(storageKey, JSON.stringify([...entries]));
+    } catch (error) {
+      console.error("Distance cache could not be saved:", error);
+    }
+  };
+
+  const keyFor = (kind, coords) =>
+    `${kind}:${Number(coords.lat).toFixed(precision)},${Number(
+      coords.lng
+    ).toFixed(precision)}`;
+
+  // Returns the cached result for these coordinates, or computes and stores it
+  const get = (kind, coords, compute) => {
+    const key = keyFor(kind, coords);
+    if (entries.has(key)) {
+      const value = entries.get(key);
+      // Move the entry to the most recently used end, and keep that order
+      // across reloads
+      entries.delete(key);
+      entries.set(key, value);
+      save();
+      stats.hits += 1;
+      return value;
+    }
+    stats.misses += 1;
+    const value = compute();
+    const distance = typeof value === "number" ? value : value.distance;
+    if (isNaN(distance)) {
+      return value; // Invalid coordinates are not worth keeping
+    }
+    entries.set(key, value);
+    while (entries.size > maxSize) {
+      entries.delete(entries.keys().next().value);
+      stats.evictions += 1;
+    }
+    save();
+    return value;
+  };
+
+  const clear = () => {
+    entries.clear();
+    localStorage.removeItem(storageKey);
+  };
+
+  return {
+    get,
+    clear,
+    stats: () => ({ ...stats, size: entries.size, maxSize, precision }),
+  };
+}
+
+export const distanceCache = createDistanceCache({
+  maxSize: integerSetting(
+    process.env.REACT_APP_DISTANCE_CACHE_SIZE,
+    500,
+    1,
+    Number.MAX_SAFE_INTEGER
+  ),
+  // toFixed takes 0-100 digits
+  precision: integerSetting(
+    process.env.REACT_APP_DISTANCE_CACHE_PRECISION,
+    6,
+    0,
+    100
+  ),
+});
@@ -0,0 +1,99 @@
+// Compact Earth-Sun ephemeris.
+// The Earth-Sun distance and the equation of center only depend on the mean
+// anomaly, so they are tabulated once over one orbit (Kepler's equation is
+// solved when the module loads) and linearly interpolated afterwards. A lookup
+// costs a few multiplications instead of an iterative orbital solve.
+
+export const AU_KM = 149597870.7;
+export const ECCENTRICITY = 0.0167086;
+const SEMI_MAJOR_AXIS_AU = 1.000001018;
+export const TABLE_SIZE = 4096;
+
+const DEG = Math.PI / 180;
+const TWO_PI = 2 * Math.PI;
+const J2000_MS = Date.UTC(2000, 0, 1, 12); // 2000-01-01 12:00 UTC
+const DAY_MS = 86400000;
+
+export function solveKepler(meanAnomaly, eccentricity = ECCENTRICITY) {
+  let E = meanAnomaly + eccentricity * Math.sin(meanAnomaly);
+  for (let i = 0; i < 5; i++) {
+    E -=
+      (E - eccentricity * Math.sin(E) - meanAnomaly) /
+      (1 - eccentricity * Math.cos(E));
+  }
+  return E;
+}
+
+// distanceTable[i] is the Earth-Sun distance in km and centerTable[i] the true
+// minus mean anomaly in radians, at mean anomaly 2 * PI * i / TABLE_SIZE. The
+// extra last entry repeats the first so interpolation never wraps.
+export const distanceTable = new Float64Array(TABLE_SIZE + 1);
+export const centerTable = new Float64Array(TABLE_SIZE + 1);
+
+for (let i = 0; i <= TABLE_SIZE; i++) {
+  const M = (TWO_PI * i) / TABLE_SIZE;
+  const E = solveKepler(M);
+  const trueAnomaly =
+    2 *
+    Math.atan2(
+      Math.sqrt(1 + ECCENTRICITY) * Math.sin(E / 2),
+      Math.sqrt(1 - ECCENTRICITY) * Math.cos(E / 2)
+    );
+  distanceTable[i] =
+    SEMI_MAJOR_AXIS_AU * (1 - ECCENTRICITY * Math.cos(E)) * AU_KM;
+  let center = trueAnomaly - M;
+  center -= TWO_PI * Math.round(center / TWO_PI);
+  centerTable[i] = center;
+}
+
+function interpolate(table, meanAnomaly) {
+  let M = meanAnomaly % TWO_PI;
+  if (M < 0) M += TWO_PI;
+  const x = (M / TWO_PI) * TABLE_SIZE;
+  const i = Math.min(Math.floor(x), TABLE_SIZE - 1);
+  const fraction = x - i;
+  return table[i] + (table[i + 1] - table[i]) * fraction;
+}
+
+// Geocentric position of the Sun at a timestamp (ms since the epoch):
+// distance in km and unit vector in Earth-fixed (ECEF) coordinates
+export function sunPosition(timestamp) {
+  const days = (timestamp - J2000_MS) / DAY_MS;
+  const centuries = days / 36525;
+  const meanAnomaly = (357.52911 + 0.98560028 * days) * DEG;
+  const perihelion = (282.9404 + 4.70935e-5 * days) * DEG;
+  const longitude = perihelion + meanAnomaly + interpolate(centerTable, meanAnomaly);
+  const obliquity = (23.439291 - 0.0130042 * centuries) * DEG;
+
+  // Equatorial unit vector of the Sun, rotated by sidereal time into the
+  // Earth-fixed frame (no need to go through right ascension and declination)
+  const X = Math.cos(longitude);
+  const Y = Math.cos(obliquity) * Math.sin(longitude);
+  const Z = Math.sin(obliquity) * Math.sin(longitude);
+  const siderealTime = (280.46061837 + 360.98564736629 * days) * DEG;
+  const cosTheta = Math.cos(siderealTime);
+  const sinTheta = Math.sin(siderealTime);
+
+  return {
+    distance: interpolate(distanceTable, meanAnomaly),
+    x: X * cosTheta + Y * sinTheta,
+    y: Y * cosTheta - X * sinTheta,
+    z: Z,
+  };
+}
+
+// WGS84 position of a point at sea level, in km from Earth's center
+const WGS84_A = 6378.137;
+const WGS84_F = 1 / 298.257223563;
+const WGS84_E2 = WGS84_F * (2 - WGS84_F);
+
+export function observerPosition(lat, lng) {
+  const phi = lat * DEG;
+  const lambda = lng * DEG;
+  const N = WGS84_A / Math.sqrt(1 - WGS84_E2 * Math.sin(phi) * Math.sin(phi));
+  return {
+    x: N * Math.cos(phi) * Math.cos(lambda),
+    y: N * Math.cos(phi) * Math.sin(lambda),
+    z: N * (1 - WGS84_E2) * Math.sin(phi),
+  };
+}
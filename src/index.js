@@ -3,18 +3,24 @@ import ReactDOM from "react-dom/client";
 import "./index.css";
 import App from "./App";
 import reportWebVitals from "./reportWebVitals";
-import { GoogleOAuthProvider } from "@react-oauth/google";
 import { BrowserRouter } from "react-router-dom";
 
 const root = ReactDOM.createRoot(document.getElementById("root"));
 root.render(
   <React.StrictMode>
-    <GoogleOAuthProvider clientId="213591742347-23gmgjsok7p1siuukva9sm7gvofs757o.apps.googleusercontent.com">
-      <BrowserRouter>
-        <App />
-      </BrowserRouter>
-    </GoogleOAuthProvider>
+    <BrowserRouter>
+      <App />
+    </BrowserRouter>
   </React.StrictMode>
 );
 
-reportWebVitals();
+// Test builds expose the pure functions for parity.py. The condition is fixed at
+// build time, so other builds leave the module out.
+if (process.env.REACT_APP_TEST_HOOKS === "true") {
+  import("./testHooks");
+}
+
+// Keep the latest web-vitals on window so the selenium benchmark can read them
+reportWebVitals((metric) => {
+  window.__webVitals = { ...window.__webVitals, [metric.name]: metric.value };
+});
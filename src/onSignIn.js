@@ -1,10 +1,21 @@
-export const onSignIn = (email, password = "") => {
-  if (email === "validationtest542@gmail.com") {
-    return true;
+import { authProvider, saveSession } from "./authProvider";
+
+// Resolves to true and caches the session when the credentials are valid
+export const onSignIn = async (email, password = "") => {
+  const session = await authProvider.signIn(email, password);
+  if (!session) {
+    return false;
   }
+  saveSession(session);
+  return true;
+};
 
-  if (email === "name@mail.com" && password === "password") {
-    return true;
+// Same for a Google ID token, which the provider checks for a verified email
+export const onGoogleSignIn = async (credential) => {
+  const session = await authProvider.signInWithGoogle(credential);
+  if (!session) {
+    return false;
   }
-  return false;
+  saveSession(session);
+  return true;
 };
@@ -0,0 +1,41 @@
+// Commit counts and render durations per component, collected with
+// React.Profiler. Wrap what a component returns in <Profiled id="Name"> so a
+// memoized component that skips rendering is not counted. React only calls
+// onRender in development and profiling builds. src/testHooks.js exposes the
+// counters as window.__renderStats.
+import React, { Profiler } from "react";
+
+const stats = {};
+
+function onRender(id, phase, actualDuration) {
+  const entry =
+    stats[id] ||
+    (stats[id] = {
+      commits: 0,
+      mounts: 0,
+      updates: 0,
+      totalDuration: 0,
+      maxDuration: 0,
+    });
+  entry.commits += 1;
+  if (phase === "mount") {
+    entry.mounts += 1;
+  } else {
+    entry.updates += 1;
+  }
+  entry.totalDuration += actualDuration;
+  entry.maxDuration = Math.max(entry.maxDuration, actualDuration);
+}
+
+export const renderStats = {
+  get: () => JSON.parse(JSON.stringify(stats)),
+  reset: () => Object.keys(stats).forEach((id) => delete stats[id]),
+};
+
+export function Profiled({ id, children }) {
+  return (
+    <Profiler id={id} onRender={onRender}>
+      {children}
+    </Profiler>
+  );
+}
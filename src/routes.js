@@ -0,0 +1,21 @@
+// Loaders for the route chunks. App uses them with React.lazy, and pages call
+// prefetchRoute for the route the user is likely to open next. webpack loads a
+// chunk only once, so a prefetched page renders without waiting for the network.
+
+export const loadDistanceToSunPage = () => import("./DistanceToSunPage");
+export const loadNearestSeaPage = () => import("./NearestSeaPage");
+
+// Runs callback once the browser is idle, returns a function that cancels it
+export function whenIdle(callback) {
+  if ("requestIdleCallback" in window) {
+    const handle = window.requestIdleCallback(callback, { timeout: 2000 });
+    return () => window.cancelIdleCallback(handle);
+  }
+  const handle = setTimeout(callback, 200);
+  return () => clearTimeout(handle);
+}
+
+// Starts downloading a route chunk once the browser is idle
+export function prefetchRoute(loadRoute) {
+  return whenIdle(() => loadRoute().catch(() => {})); // The lazy route retries on navigation
+}
@@ -0,0 +1,189 @@
+// Spatial index for nearest-sea lookups.
+// Sea points are stored as unit vectors in a k-d tree. The straight-line (chord)
+// distance between unit vectors grows with the great-circle distance, so the
+// nearest point by chord is also the nearest by haversine, and a query only
+// visits O(log n) points instead of scanning all of them.
+
+const R = 6371; // Earth's radius in kilometers
+// Seas this much further away by chord than the nearest may still tie with it
+// by haversine, so they are compared the way the linear scan does
+const TIE_TOLERANCE = 1e-9;
+const toRadians = (degree) => (degree * Math.PI) / 180;
+
+export function haversineDistance(lat, lng, seaLat, seaLng) {
+  const latDistance = toRadians(seaLat - lat);
+  const lngDistance = toRadians(seaLng - lng);
+  const a =
+    Math.sin(latDistance / 2) * Math.sin(latDistance / 2) +
+    Math.cos(toRadians(lat)) *
+      Math.cos(toRadians(seaLat)) *
+      Math.sin(lngDistance / 2) *
+      Math.sin(lngDistance / 2);
+  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+  return R * c;
+}
+
+function toUnitVector(lat, lng, out, offset) {
+  const phi = toRadians(lat);
+  const lambda = toRadians(lng);
+  out[offset] = Math.cos(phi) * Math.cos(lambda);
+  out[offset + 1] = Math.cos(phi) * Math.sin(lambda);
+  out[offset + 2] = Math.sin(phi);
+}
+
+// FNV-1a hash of the points and names, so two datasets of the same size do not
+// share distance cache entries
+function datasetId(seas) {
+  let hash = 0x811c9dc5;
+  seas.forEach((sea) => {
+    const text = `${sea.lat},${sea.lng},${sea.name};`;
+    for (let i = 0; i < text.length; i++) {
+      hash = Math.imul(hash ^ text.charCodeAt(i), 0x01000193);
+    }
+  });
+  return (hash >>> 0).toString(36);
+}
+
+export function buildSeaIndex(seas) {
+  const points = new Float64Array(seas.length * 3);
+  seas.forEach((sea, i) => toUnitVector(sea.lat, sea.lng, points, i * 3));
+
+  // Implicit balanced tree: the node for [lo, hi) sits at its median position,
+  // with its children in [lo, mid) and [mid + 1, hi)
+  const order = new Int32Array(seas.length).map((_, i) => i);
+  const axes = new Uint8Array(seas.length);
+
+  const build = (lo, hi) => {
+    if (hi - lo < 2) return;
+    // Split on the axis with the largest spread
+    let axis = 0;
+    let widest = -1;
+    for (let k = 0; k < 3; k++) {
+      let min = Infinity;
+      let max = -Infinity;
+      for (let i = lo; i < hi; i++) {
+        const value = points[order[i] * 3 + k];
+        if (value < min) min = value;
+        if (value > max) max = value;
+      }
+      if (max - min > widest) {
+        widest = max - min;
+        axis = k;
+      }
+    }
+    order
+      .subarray(lo, hi)
+      .sort((a, b) => points[a * 3 + axis] - points[b * 3 + axis] || a - b);
+    const mid = (lo + hi) >> 1;
+    axes[mid] = axis;
+    build(lo, mid);
+    build(mid + 1, hi);
+  };
+  build(0, seas.length);
+
+  const query = new Float64Array(3);
+  let best = -1;
+  let bestDistance = Infinity;
+
+  const search = (lo, hi) => {
+    if (lo >= hi) return;
+    const mid = (lo + hi) >> 1;
+    const point = order[mid] * 3;
+    const dx = query[0] - points[point];
+    const dy = query[1] - points[point + 1];
+    const dz = query[2] - points[point + 2];
+    const distance = dx * dx + dy * dy + dz * dz;
+    if (distance < bestDistance) {
+      bestDistance = distance;
+      best = order[mid];
+    }
+    const diff = query[axes[mid]] - points[point + axes[mid]];
+    if (diff < 0) {
+      search(lo, mid);
+      if (diff * diff < bestDistance) search(mid + 1, hi);
+    } else {
+      search(mid + 1, hi);
+      if (diff * diff < bestDistance) search(lo, mid);
+    }
+  };
+
+  // Every sea within `limit` (squared chord distance) of the query
+  const candidates = [];
+  const collect = (lo, hi, limit) => {
+    if (lo >= hi) return;
+    const mid = (lo + hi) >> 1;
+    const point = order[mid] * 3;
+    const dx = query[0] - points[point];
+    const dy = query[1] - points[point + 1];
+    const dz = query[2] - points[point + 2];
+    if (dx * dx + dy * dy + dz * dz <= limit) candidates.push(order[mid]);
+    const diff = query[axes[mid]] - points[point + axes[mid]];
+    if (diff < 0) {
+      collect(lo, mid, limit);
+      if (diff * diff <= limit) collect(mid + 1, hi, limit);
+    } else {
+      collect(mid + 1, hi, limit);
+      if (diff * diff <= limit) collect(lo, mid, limit);
+    }
+  };
+
+  const nearest = (coords) => {
+    if (!coords || coords.lat == null || coords.lng == null) {
+      return { distance: NaN, name: "" };
+    }
+    if (
+      !seas.length ||
+      !Number.isFinite(coords.lat) ||
+      !Number.isFinite(coords.lng)
+    ) {
+      // Same result as the linear scan, whose reduce ends on the last sea
+      const last = seas[seas.length - 1];
+      return { distance: NaN, name: last ? last.name : "" };
+    }
+    toUnitVector(coords.lat, coords.lng, query, 0);
+    best = -1;
+    bestDistance = Infinity;
+    search(0, seas.length);
+    // Settle near-ties like the linear scan's reduce: in the original order,
+    // a sea replaces the nearest so far unless that one is strictly closer
+    candidates.length = 0;
+    collect(0, seas.length, bestDistance * (1 + TIE_TOLERANCE));
+    candidates.sort((a, b) => a - b);
+    let result = null;
+    candidates.forEach((index) => {
+      const sea = seas[index];
+      const distance = haversineDistance(
+        coords.lat,
+        coords.lng,
+        sea.lat,
+        sea.lng
+      );
+      if (!(result && result.distance < distance)) {
+        result = { distance, name: sea.name };
+      }
+    });
+    return result;
+  };
+
+  return { size: seas.length, id: datasetId(seas), nearest };
+}
+
+// Fetches a JSON array of { lat, lng, name } sea points and indexes it
+export function loadSeaIndex(url) {
+  return fetch(url)
+    .then((response) => response.json())
+    .then((seas) => buildSeaIndex(seas));
+}
+
+// The linear scan the page used before the index, kept for benchmarks and checks
+export function linearNearestSea(seas, coords) {
+  if (!coords || coords.lat == null || coords.lng == null) {
+    return { distance: NaN, name: "" };
+  }
+  return seas
+    .map((sea) => ({
+      distance: haversineDistance(coords.lat, coords.lng, sea.lat, sea.lng),
+      name: sea.name,
+    }))
+    .reduce((prev, curr) => (prev.distance < curr.distance ? prev : curr));
+}
@@ -0,0 +1,42 @@
+import { observerPosition, sunPosition } from "./ephemeris";
+
+function validCoords(coords) {
+  if (!coords || coords.lat == null || coords.lng == null) {
+    return false;
+  }
+  // Coordinates must be numeric and within valid ranges
+  return !(
+    isNaN(coords.lat) ||
+    isNaN(coords.lng) ||
+    coords.lat < -90 ||
+    coords.lat > 90 ||
+    coords.lng < -180 ||
+    coords.lng > 180
+  );
+}
+
+export function solarDistanceCalculator(coords) {
+  const averageDistanceToSun = 149600000; // Average distance from Earth to the Sun in kilometers
+  if (!validCoords(coords)) {
+    return NaN; // Return NaN if coordinates are invalid
+  }
+
+  // Calculate the distance (simplified for the example, without date considerations)
+  const latitudeAdjustment = (coords.lat / 90.0) * 100000; // Simulated adjustment
+  return averageDistanceToSun - latitudeAdjustment;
+}
+
+// Distance in km from an observer at sea level to the Sun's center at
+// `timestamp` (ms since the epoch), using the ephemeris table for the Earth-Sun
+// distance and the WGS84 ellipsoid for the observer
+export function preciseSolarDistance(coords, timestamp) {
+  if (!validCoords(coords) || !Number.isFinite(timestamp)) {
+    return NaN;
+  }
+  const sun = sunPosition(timestamp);
+  const observer = observerPosition(coords.lat, coords.lng);
+  const dx = sun.distance * sun.x - observer.x;
+  const dy = sun.distance * sun.y - observer.y;
+  const dz = sun.distance * sun.z - observer.z;
+  return Math.sqrt(dx * dx + dy * dy + dz * dz);
+}
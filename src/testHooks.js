@@ -0,0 +1,86 @@
+// Handles the selenium suite reads with execute_script, only in builds made
+// with REACT_APP_TEST_HOOKS=true.
+//
+// window.__pure holds the app's pure functions, for parity.py to check against
+// its Python references. `run` takes { name: [args, ...] } and evaluates every
+// case in the one execute_script call, timing each function inside the browser.
+import { createDistanceCache, distanceCache } from "./distanceCache";
+import { calculateDistanceToNearestSea } from "./NearestSeaPage";
+import { renderStats } from "./renderProfiler";
+import {
+  preciseSolarDistance,
+  solarDistanceCalculator,
+} from "./solarDistance";
+import { validateCoordinates, validateEmail } from "./validators";
+
+export const pureFunctions = {
+  parseFloat,
+  validateCoordinates,
+  validateEmail,
+  solarDistanceCalculator,
+  calculateDistanceToNearestSea,
+};
+
+// WebDriver passes values as JSON, which has no NaN, Infinity or -0, so those
+// travel as { $number: "NaN" } in both directions
+function encode(value) {
+  if (typeof value === "number") {
+    return Number.isFinite(value) && !Object.is(value, -0)
+      ? value
+      : { $number: Object.is(value, -0) ? "-0" : String(value) };
+  }
+  if (Array.isArray(value)) {
+    return value.map(encode);
+  }
+  if (value && typeof value === "object") {
+    return Object.fromEntries(
+      Object.entries(value).map(([key, item]) => [key, encode(item)])
+    );
+  }
+  return value;
+}
+
+function decode(value) {
+  if (Array.isArray(value)) {
+    return value.map(decode);
+  }
+  if (value && typeof value === "object") {
+    if ("$number" in value) {
+      return Number(value.$number);
+    }
+    return Object.fromEntries(
+      Object.entries(value).map(([key, item]) => [key, decode(item)])
+    );
+  }
+  return value;
+}
+
+function call(fn, args) {
+  try {
+    return fn(...args);
+  } catch (error) {
+    return { $error: String(error) };
+  }
+}
+
+export function run(batches) {
+  const report = {};
+  Object.entries(batches).forEach(([name, cases]) => {
+    const fn = pureFunctions[name];
+    const decoded = decode(cases);
+    const start = performance.now();
+    const results = decoded.map((args) => call(fn, args));
+    const elapsedMs = performance.now() - start;
+    report[name] = { results: encode(results), elapsedMs };
+  });
+  return report;
+}
+
+window.__pure = { functions: pureFunctions, run };
+// Both solar distances, to check many (lat, lng, time) triples against
+// solar_distance.py with one execute_script
+window.__solarDistance = { solarDistanceCalculator, preciseSolarDistance };
+// The distance cache's hit/miss counters, and its factory for isolated checks
+window.__distanceCache = { ...distanceCache, createDistanceCache };
+// Commits and render durations per profiled component, with get and reset
+window.__renderStats = renderStats;
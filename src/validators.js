@@ -0,0 +1,20 @@
+// Input checks shared by the pages. parity.py holds their Python references.
+
+// Returns the error to show for parsed coordinates, or "" when they are valid
+export function validateCoordinates(lat, lng) {
+  if (isNaN(lat) || isNaN(lng)) {
+    return "Coordinates must be numeric.";
+  }
+  if (lat < -90 || lat > 90) {
+    return "Latitude must be between -90 and 90 degrees.";
+  }
+  if (lng < -180 || lng > 180) {
+    return "Longitude must be between -180 and 180 degrees.";
+  }
+  return "";
+}
+
+export function validateEmail(email) {
+  const regex = /^[\w-\.]+@([\w-]+\.)+[\w-]{2,4}$/;
+  return regex.test(email);
+}
@@ -17,7 +17,7 @@ describe('template spec', () => {
     cy.get("#lat").type("500")
     cy.get("#lon").type("500")
     cy.get("#sunCal").click()
-    cy.wait(5000)
+    cy.contains("Latitude must be between -90 and 90 degrees.").should("be.visible")
   })
 })
 
@@ -30,7 +30,7 @@ describe('template spec', () => {
     cy.get("#lat").type("50")
     cy.get("#lon").type("50")
     cy.get("#sunCal").click()
-    cy.wait(5000)
+    cy.contains("Distance:").should("not.contain", "Please enter coordinates")
   })
 })
 
@@ -40,13 +40,13 @@ describe('template spec', () => {
     cy.viewport("iphone-6")
     cy.get("#email").type("name@mail.com")
     cy.get("#password").type("password")
-    cy.wait(5000)
     cy.get("#login").click()
+    cy.location("pathname").should("eq", "/distance-to-sun")
     cy.viewport("samsung-s10")
     cy.get("#lat").type("50")
     cy.get("#lon").type("50")
     cy.get("#sunCal").click()
-    cy.wait(5000)
+    cy.contains("Distance:").should("not.contain", "Please enter coordinates")
   })
 })
 
@@ -56,12 +56,12 @@ describe('template spec', () => {
     cy.viewport(300,300)
     cy.get("#email").type("name@mail.com")
     cy.get("#password").type("password")
-    cy.wait(5000)
     cy.get("#login").click()
+    cy.location("pathname").should("eq", "/distance-to-sun")
     cy.viewport(250,800)
     cy.get("#lat").type("50")
     cy.get("#lon").type("50")
     cy.get("#sunCal").click()
-    cy.wait(5000)
+    cy.contains("Distance:").should("not.contain", "Please enter coordinates")
   })
 })
\ No newline at end of file
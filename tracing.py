@@ -0,0 +1,199 @@
+"""Timing trace for the selenium suite.
+
+With SELENIUM_TRACE=trace.json set, every driver call a test makes (get,
+find_element, send_keys, click, waits, scripts and CDP commands) is recorded
+as a span nested under the test's span. Before each navigation and at the end
+of each test, the browser's own Performance entries for the page are added.
+The result is written as Chrome trace-event JSON, which opens in
+chrome://tracing or https://ui.perfetto.dev. The slowest steps of the run are
+logged when it finishes.
+
+Only a test's own steps count towards those totals. Calls made inside another
+step, such as the script behind a wait, are drawn nested under it in the trace
+but not counted again. Resetting the shared browser before a test is recorded
+under that test's "setup" span, and calls outside any test are not recorded.
+"""
+import atexit
+import contextlib
+import json
+import logging
+import os
+import time
+from urllib.parse import urlsplit
+from selenium.webdriver.remote.webelement import WebElement
+
+PYTHON_PID = 1
+BROWSER_PID = 2
+
+DRIVER_CALLS = (
+    "get", "back", "refresh", "find_element", "find_elements",
+    "execute_script", "execute_async_script", "execute_cdp_cmd",
+)
+ELEMENT_CALLS = ("click", "send_keys", "clear", "submit", "find_element", "find_elements")
+
+BROWSER_ENTRIES_SCRIPT = """
+return {
+  timeOrigin: performance.timeOrigin,
+  entries: performance.getEntries().map((entry) => ({
+    name: entry.name,
+    entryType: entry.entryType,
+    startTime: entry.startTime,
+    duration: entry.duration,
+  })),
+};
+"""
+
+
+def now_us():
+    return time.time() * 1e6
+
+
+def describe(name, args):
+    """Short span name for a driver call, e.g. "get /nearest-sea" or "find_element xpath"."""
+    if not args:
+        return name
+    first = args[0]
+    if name == "get":
+        return f"get {urlsplit(first).path or '/'}"
+    if name == "execute_cdp_cmd":
+        return f"cdp {first}"
+    if name in ("find_element", "find_elements") and len(args) > 1:
+        return f"{name} {first}={str(args[1])[:60]}"
+    return name
+
+
+class Tracer:
+    """Collects nested spans and browser entries as Chrome trace events."""
+
+    def __init__(self, path):
+        self.path = path
+        self.events = [
+            {"name": "process_name", "ph": "M", "pid": PYTHON_PID, "args": {"name": "selenium"}},
+            {"name": "process_name", "ph": "M", "pid": BROWSER_PID, "args": {"name": "browser"}},
+        ]
+        self.totals = {}  # span name -> [count, total seconds, max seconds]
+        self.open_spans = []  # categories of the spans being recorded, outermost first
+        self.seen_entries = set()
+        self.browser_threads = {}  # entryType -> tid
+
+    @contextlib.contextmanager
+    def span(self, name, category, **args):
+        record = bool(self.open_spans) or category in ("test", "setup")
+        # A step directly under a test, or a setup, rather than one nested in another step
+        counted = category != "test" and all(open_category == "test" for open_category in self.open_spans)
+        self.open_spans.append(category)
+        start = now_us()
+        try:
+            yield
+        finally:
+            duration = now_us() - start
+            self.open_spans.pop()
+            if record:
+                self.events.append({
+                    "name": name, "cat": category, "ph": "X", "ts": start, "dur": duration,
+                    "pid": PYTHON_PID, "tid": 1, "args": args,
+                })
+            if record and counted:
+                total = self.totals.setdefault(name, [0, 0.0, 0.0])
+                total[0] += 1
+                total[1] += duration / 1e6
+                total[2] = max(total[2], duration / 1e6)
+
+    def collect_browser_entries(self, driver):
+        """Add the current page's Performance entries, once each."""
+        try:
+            # Call the undecorated method so collecting does not show up as a span
+            data = type(driver).execute_script(driver, BROWSER_ENTRIES_SCRIPT)
+        except Exception:
+            return  # No page loaded yet, or an alert is open
+        origin = data["timeOrigin"] * 1000
+        for entry in data["entries"]:
+            key = (origin, entry["entryType"], entry["name"], entry["startTime"])
+            if key in self.seen_entries:
+                continue
+            self.seen_entries.add(key)
+            self.events.append({
+                "name": entry["name"][-80:] or entry["entryType"], "cat": entry["entryType"],
+                "ph": "X", "ts": origin + entry["startTime"] * 1000, "dur": entry["duration"] * 1000,
+                "pid": BROWSER_PID, "tid": self.browser_thread(entry["entryType"]),
+            })
+
+    def browser_thread(self, entry_type):
+        """One track per entry type (navigation, resource, paint, ...) in the browser process."""
+        if entry_type not in self.browser_threads:
+            tid = self.browser_threads[entry_type] = len(self.browser_threads) + 1
+            self.events.append({
+                "name": "thread_name", "ph": "M", "pid": BROWSER_PID, "tid": tid, "args": {"name": entry_type},
+            })
+        return self.browser_threads[entry_type]
+
+    def write(self):
+        with open(self.path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+    def close(self):
+        self.write()
+        log_slowest(self.totals)
+        logging.info(f"Trace written to {self.path}")
+
+
+def log_slowest(totals, count=20):
+    """Log the spans that took the most time in total across the run."""
+    ranked = sorted(totals.items(), key=lambda item: -item[1][1])[:count]
+    if not ranked:
+        return
+    logging.info("Slowest steps (total / calls / max):")
+    for name, (calls, total, longest) in ranked:
+        logging.info(f"  {total:8.3f}s {calls:5d}x {longest:7.3f}s  {name}")
+
+
+def traced(method, tracer, name, category):
+    def wrapper(*args, **kwargs):
+        with tracer.span(describe(name, args), category):
+            return method(*args, **kwargs)
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+class TracedElement(WebElement):
+    """WebElement whose interactions are recorded by the driver's tracer."""
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if name in ELEMENT_CALLS:
+            tracer = getattr(super().__getattribute__("_parent"), "tracer", None)
+            if tracer is not None:
+                return traced(attribute, tracer, name, "element")
+        return attribute
+
+
+def instrument(driver, tracer):
+    """Record the driver's calls, and those of the elements it returns, with `tracer`."""
+    if getattr(driver, "tracer", None) is tracer:
+        return driver
+    driver.tracer = tracer
+    driver._web_element_cls = TracedElement
+    for name in DRIVER_CALLS:
+        method = getattr(type(driver), name).__get__(driver)
+        if name == "get":
+            method = collect_before(method, tracer, driver)
+        setattr(driver, name, traced(method, tracer, name, "driver"))
+    return driver
+
+
+def collect_before(get, tracer, driver):
+    """Wrap driver.get to keep the leaving page's Performance entries."""
+    def wrapper(url):
+        tracer.collect_browser_entries(driver)
+        return get(url)
+    return wrapper
+
+
+def tracer_from_env():
+    """Return a Tracer writing to $SELENIUM_TRACE, or None when tracing is off."""
+    path = os.environ.get("SELENIUM_TRACE")
+    if not path:
+        return None
+    tracer = Tracer(path)
+    atexit.register(tracer.close)
+    return tracer
@@ -0,0 +1,188 @@
+"""Event-driven waits for the selenium tests.
+
+Instead of polling the DOM every 0.5s, a script injected into every page raises a
+signal on each DOM mutation, route change and alert(). A wait is a single
+asynchronous script that re-checks its condition on those signals and returns the
+moment it holds.
+
+alert() messages are always recorded. The dialog itself still opens, so
+EC.alert_is_present keeps working, except inside `with waiter.capture_alerts():`.
+"""
+import contextlib
+import logging
+import time
+from selenium.common.exceptions import TimeoutException
+
+# Installed with Page.addScriptToEvaluateOnNewDocument so it runs before the app on every load
+SIGNALS_SCRIPT = """
+(() => {
+  if (window.__testSignals) return;
+  const signals = { route: location.pathname, alerts: [], listeners: [] };
+  const notify = () => signals.listeners.slice().forEach((listener) => listener());
+  window.__testSignals = signals;
+
+  ["pushState", "replaceState"].forEach((name) => {
+    const original = history[name];
+    history[name] = function (...args) {
+      const result = original.apply(this, args);
+      signals.route = location.pathname;
+      notify();
+      return result;
+    };
+  });
+  window.addEventListener("popstate", () => {
+    signals.route = location.pathname;
+    notify();
+  });
+
+  // Record alerts, and only skip the blocking dialog in tabs that asked for it
+  const originalAlert = window.alert;
+  const capturing = () => {
+    try {
+      return sessionStorage.getItem("__testCaptureAlerts") === "true";
+    } catch (error) {
+      return false; // No storage on about:blank and data: URLs
+    }
+  };
+  window.alert = function (message) {
+    signals.alerts.push(String(message));
+    notify();
+    if (!capturing()) originalAlert.call(window, message);
+  };
+
+  const observe = () =>
+    new MutationObserver(notify).observe(document.documentElement, {
+      childList: true,
+      subtree: true,
+      characterData: true,
+      attributes: true,
+    });
+  if (document.documentElement) {
+    observe();
+  } else {
+    document.addEventListener("readystatechange", observe, { once: true });
+  }
+})();
+"""
+
+# Returned by WAIT_SCRIPT when the condition did not hold in time
+TIMED_OUT = "__waitTimedOut"
+
+# Resolves with the first truthy value of the condition, re-checked on every
+# signal, or with TIMED_OUT after `timeoutMs`. Either way the listener is removed
+# so finished waits do not pile up on the page.
+WAIT_SCRIPT = """
+const [source, args, timeoutMs, timedOut, done] = arguments;
+const condition = new Function("args", source);
+const signals = window.__testSignals;
+let timer = null;
+let deadline = null;
+const finish = (value) => {
+  if (signals) {
+    const index = signals.listeners.indexOf(listener);
+    if (index >= 0) signals.listeners.splice(index, 1);
+  }
+  clearInterval(timer);
+  clearTimeout(deadline);
+  done(value);
+};
+const listener = () => {
+  let value = null;
+  try {
+    value = condition(args);
+  } catch (error) {
+    value = null;
+  }
+  if (!value) return false;
+  finish(value);
+  return true;
+};
+if (!listener()) {
+  if (signals) {
+    signals.listeners.push(listener);
+  } else {
+    // Page loaded without the signals script, fall back to fast polling
+    timer = setInterval(listener, 50);
+  }
+  deadline = setTimeout(() => finish(timedOut), timeoutMs);
+}
+"""
+
+FIND_VISIBLE = """
+const node = document.evaluate(args[0], document, null,
+  XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return node && node.getClientRects().length > 0 ? node : null;
+"""
+
+
+def install_signals(driver):
+    """Inject the signals script into every page the driver loads from now on."""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SIGNALS_SCRIPT})
+
+
+class Waiter:
+    """Waits on browser signals and keeps track of how long a test spent waiting."""
+
+    def __init__(self, driver, timeout=10):
+        self.driver = driver
+        self.timeout = timeout
+        self.waited = 0.0
+        self.count = 0
+
+    def until(self, condition, description, *args, timeout=None):
+        """Wait until the JavaScript `condition` body returns a truthy value and return it."""
+        timeout = self.timeout if timeout is None else timeout
+        previous_timeout = self.driver.timeouts.script
+        # The script gives up by itself at `timeout`; the driver's limit is only a backstop
+        self.driver.set_script_timeout(timeout + 5)
+        tracer = getattr(self.driver, "tracer", None)
+        span = tracer.span(f"wait {description}", "wait") if tracer else contextlib.nullcontext()
+        start = time.perf_counter()
+        try:
+            with span:
+                value = self.driver.execute_async_script(WAIT_SCRIPT, condition, list(args), timeout * 1000, TIMED_OUT)
+        except TimeoutException:
+            value = TIMED_OUT
+        finally:
+            self.driver.set_script_timeout(previous_timeout)
+            elapsed = time.perf_counter() - start
+            self.waited += elapsed
+            self.count += 1
+            logging.debug(f"Waited {elapsed:.3f}s for {description}")
+        if value == TIMED_OUT:
+            raise TimeoutException(f"Timed out after {timeout}s waiting for {description}")
+        return value
+
+    def for_route(self, path, **kwargs):
+        """Wait for the app to be on `path`, e.g. after ProtectedRoute redirects to "/"."""
+        return self.until("return location.pathname === args[0];", f"route {path}", path, **kwargs)
+
+    def for_alert(self, text, **kwargs):
+        """Wait for an alert() whose message contains `text` and return the message."""
+        return self.until(
+            "return (window.__testSignals.alerts || []).find((m) => m.includes(args[0]));",
+            f"alert '{text}'", text, **kwargs,
+        )
+
+    def for_visible(self, xpath, **kwargs):
+        """Wait for the element at `xpath` to be rendered and return it."""
+        return self.until(FIND_VISIBLE, f"visible {xpath}", xpath, **kwargs)
+
+    @contextlib.contextmanager
+    def capture_alerts(self):
+        """Within the block, record alert() messages in this tab without opening the dialog."""
+        self.driver.execute_script('sessionStorage.setItem("__testCaptureAlerts", "true");')
+        try:
+            yield
+        finally:
+            self.driver.execute_script('sessionStorage.removeItem("__testCaptureAlerts");')
+
+    def alerted(self, text):
+        """Return True if an alert() containing `text` has already fired on this page."""
+        return self.driver.execute_script(
+            "return (window.__testSignals ? window.__testSignals.alerts : []).some((m) => m.includes(arguments[0]));",
+            text,
+        )
+
+    def report(self, test_name):
+        logging.info(f"{test_name} waited {self.waited:.3f}s in {self.count} wait(s)")